@@ -1,52 +1,32 @@
 import os
-import fitz
-import docx
-from pptx import Presentation
-from openai import OpenAI
-from dotenv import load_dotenv
-import json
 import re
+import asyncio
+from llm_engine import get_engine, DEFAULT_MODEL
+from response_cache import get_cache, make_key
+from chunking import count_tokens, split_into_chunks, chunk_records, group_for_reduce
+from json_stream import find_json_object, JsonTextStreamer
+from extraction import iter_prompt_records
+from extraction_cache import file_digest
+from boilerplate import CleanupStats
+from jobs import Job
 #mnemonics_ai, story_ai, quiz_ai, notes_ai
-# Load environment variablessd
-load_dotenv()
-api_key = os.getenv("OPENROUTER_API_KEY")
-
-# Initialize OpenAI client for OpenRouter
-client = OpenAI(
-    base_url="https://openrouter.ai/api/v1",
-    api_key=api_key,
-)
-
-def extract_json_string(response_str):
-    json_match = re.search(r'{\s*".*?"\s*:\s*(\[.*?\]|".*?")\s*}', response_str, re.DOTALL)
-    return json_match.group() if json_match else None
-
-def extract_text_from_file(filepath: str) -> str:
-    if not os.path.isfile(filepath):
-        raise ValueError("File does not exist.")
-    ext = os.path.splitext(filepath)[-1].lower()
-    if ext == '.txt':
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return f.read()
-    elif ext == '.pdf':
-        doc = fitz.open(filepath)
-        return "\n".join(page.get_text() for page in doc)
-    elif ext == '.docx':
-        doc = docx.Document(filepath)
-        return "\n".join([para.text for para in doc.paragraphs])
-    elif ext == '.pptx':
-        prs = Presentation(filepath)
-        text_runs = []
-        for slide in prs.slides:
-            for shape in slide.shapes:
-                if hasattr(shape, "text"):
-                    text_runs.append(shape.text)
-        return "\n".join(text_runs)
-    else:
-        raise ValueError("Unsupported file format")
+# Each generator is implemented once as a coroutine (*_async) on the shared
+# LLMEngine; the plain functions are blocking wrappers used by the GUI.
+# quiz, notes and story accept on_token(text) to receive the reply as it streams.
+
+# Bump whenever a prompt below changes so cached replies for the old prompt are not reused
+PROMPT_VERSION = 1
+# Documents longer than this are summarized chunk by chunk and the notes merged
+CHUNK_TOKENS = int(os.getenv("BRAMBLE_CHUNK_TOKENS", "6000"))
+# Longer documents are quizzed per section of at most this size, cut at
+# content-defined boundaries, and the questions merged locally. Every run cuts
+# the same way, so after an edit only the sections whose text changed miss the
+# response cache and are prompted again.
+QUIZ_SECTION_TOKENS = int(os.getenv("BRAMBLE_QUIZ_SECTION_TOKENS", str(CHUNK_TOKENS)))
+# Upper bound on a merged quiz, matching the range QUIZ_PROMPT asks for
+QUIZ_MAX_QUESTIONS = 25
 
-def generate_quiz_and_answers(text: str) -> dict:
-    prompt = """
+QUIZ_PROMPT = """
     You are an expert educational assistant tasked with creating a quiz based on the content of a user-uploaded file, typically a presentation (e.g., PowerPoint, PDF) provided by university professors.
     Your goal is to generate a short quiz to test understanding of the key concepts, facts, and ideas in the presentation.
     Follow these guidelines:
@@ -86,52 +66,8 @@ def generate_quiz_and_answers(text: str) -> dict:
     ```
     Ensure each question and answer is a single string, even for complex answers.
     """
-    try:
-        response = client.chat.completions.create(
-            model="meta-llama/llama-4-maverick:free",
-            messages=[{"role": "user", "content": prompt + "\n\n" + text}],
-            temperature=0.7
-        )
-        raw_content = response.choices[0].message.content.strip()
-        json_str = extract_json_string(raw_content)
-        if not json_str:
-            raise ValueError("No valid JSON object found in the response.")
-        data = json.loads(json_str)
-        if not isinstance(data, dict) or "quiz" not in data or "answers" not in data:
-            raise ValueError("Response does not contain 'quiz' and 'answers' keys.")
-        quiz = [str(q).strip() for q in data["quiz"]]
-        answers = [str(a).strip() for a in data["answers"]]
-        if len(quiz) != len(answers):
-            raise ValueError(f"Mismatch between number of questions ({len(quiz)}) and answers ({len(answers)}).")
-        return {"quiz": quiz, "answers": answers}
-    except Exception as e:
-        print(f"Error generating quiz: {e}")
-        return None
-
-
-def quiz_ai(text: str) -> str:
-    if not text.strip():
-        raise ValueError("Input text is empty or invalid.")
-    result = generate_quiz_and_answers(text)
-    if result is None:
-        raise ValueError("Failed to generate quiz. The file may lack sufficient material.")
-    quiz = result.get("quiz", [])
-    answers = result.get("answers", [])
-    if not quiz or not answers or len(quiz) != len(answers):
-        raise ValueError("Invalid quiz data: missing or mismatched questions and answers.")
-    formatted_output = []
-    for i, question in enumerate(quiz, 1):
-        cleaned_question = re.sub(r'^Question\s*\d+:\s*', '', question, flags=re.IGNORECASE).strip()
-        formatted_output.append(f"{i}. Question: {cleaned_question}")
-    formatted_output.append("Answers:")
-    for i, answer in enumerate(answers, 1):
-        cleaned_answer = re.sub(r'^Answer\s*\d+:\s*', '', answer, flags=re.IGNORECASE).strip()
-        formatted_output.append(f"{i}. Answer: {cleaned_answer}")
-    return "\n".join(formatted_output)
-
 
-def notes_ai(text: str) -> str:
-    prompt = """
+NOTES_PROMPT = """
     You are an expert educational assistant tasked with creating concise study notes based on the content of a user-uploaded file, typically a presentation (e.g., PowerPoint, PDF) provided by university professors.
     Your goal is to generate a short summary with bullet points highlighting the key concepts, facts, definitions, theories, and examples in the content.
     Follow these guidelines:
@@ -155,33 +91,15 @@ def notes_ai(text: str) -> str:
        - Use a professional academic tone.
        - Ensure the notes are clear, organized, and useful for studying.
     **Important: Only return a JSON object with the following exact structure:**
-    ```
-        1. Bullet point 1
-        2. Bullet point 2
-        3. Bullet point 3
-        ...
+    ```json
+    {
+      "notes": ["Summary: ...", "- Bullet point 1", "- Bullet point 2", "..."]
+    }
     ```
     Ensure each note (summary and bullet points) is a single string.
     """
-    response = client.chat.completions.create(
-        model="meta-llama/llama-4-maverick:free",
-        messages=[{"role": "user", "content": prompt + "\n\n" + text}],
-        temperature=0.7
-    )
-    raw_content = response.choices[0].message.content.strip()
-    json_str = extract_json_string(raw_content)
-    if not json_str:
-        raise ValueError("No valid JSON object found in the response.")
-    data = json.loads(json_str)
-    if not isinstance(data, dict) or "notes" not in data:
-        raise ValueError("Response does not contain 'notes' key.")
-    notes = [str(n).strip() for n in data["notes"]]
-    if not notes:
-        raise ValueError("No notes generated.")
-    return "\n\n".join(notes)
 
-def mnemonics_ai(words: list) -> str:
-    prompt = """
+MNEMONICS_PROMPT = """
     You are an expert educational assistant tasked with creating mnemonic aids for a list of user-provided words to help with memorization.
     Your goal is to generate creative and effective mnemonics using techniques such as acronyms, associations, imagery, or rhymes.
     Follow these guidelines:
@@ -214,27 +132,8 @@ def mnemonics_ai(words: list) -> str:
     ```
     Ensure each mnemonic entry is a single string.
     """
-    if not words:
-        return ""
-    response = client.chat.completions.create(
-        model="meta-llama/llama-4-maverick:free",
-        messages=[{"role": "user", "content": prompt + "\n\nWords: " + ", ".join(words)}],
-        temperature=0.7
-    )
-    raw_content = response.choices[0].message.content.strip()
-    json_str = extract_json_string(raw_content)
-    if not json_str:
-        raise ValueError("No valid JSON object found in the response.")
-    data = json.loads(json_str)
-    if not isinstance(data, dict) or "mnemonics" not in data:
-        raise ValueError("Response does not contain 'mnemonics' key.")
-    mnemonics = [str(m).strip() for m in data["mnemonics"]]
-    if not mnemonics and words:
-        raise ValueError("No mnemonics generated.")
-    return "\n\n".join(mnemonics)
 
-def story_ai(words: list) -> str:
-    prompt = """
+STORY_PROMPT = """
     You are a creative storytelling assistant tasked with generating an engaging story based on a list of user-provided words.
     Your goal is to create a coherent and imaginative narrative (300-500 words) that incorporates all the provided words in a meaningful way.
     Follow these guidelines:
@@ -264,24 +163,356 @@ def story_ai(words: list) -> str:
     ```
     Ensure the story is a single string.
     """
+
+MERGE_NOTES_PROMPT = """
+    You are an expert educational assistant. Below are study notes written separately for consecutive sections of one document, separated by "---".
+    Your goal is to merge them into a single set of concise study notes for the whole document.
+    Follow these guidelines:
+    1. Combine:
+       - Write one brief introductory summary (1-2 sentences) covering the whole document.
+       - Merge overlapping bullet points and drop repetitions.
+       - Keep the 5-10 most important bullet points, in the order the topics appear.
+    2. Style:
+       - Use a professional academic tone.
+       - Keep each bullet point concise and focused (1-2 sentences).
+    **Important: Only return a JSON object with the following exact structure:**
+    ```json
+    {
+      "notes": ["Summary: ...", "- Bullet point 1", "- Bullet point 2", "..."]
+    }
+    ```
+    Ensure each note (summary and bullet points) is a single string.
+    """
+
+async def ask_model(kind: str, prompt: str, payload: str, parse, on_token=None,
+                    model: str = DEFAULT_MODEL, temperature: float = 0.7):
+    """Send prompt + payload to the model and return parse(reply).
+
+    Replies are cached by (kind, PROMPT_VERSION, model, params, payload); only
+    replies that parse successfully are stored, under the model that actually
+    wrote them, so a fallback model's reply is never served as model's.
+    """
+    if on_token:
+        # Show the decoded JSON string values rather than raw JSON
+        on_token = JsonTextStreamer(on_token).feed
+    cache = get_cache()
+    key = make_key(kind, PROMPT_VERSION, model, {"temperature": temperature}, payload) if cache else None
+    raw_content = cache.get(key) if cache else None
+    if raw_content is not None:
+        if on_token:
+            on_token(raw_content)
+        return parse(raw_content)
+    raw_content, served = await get_engine().complete_with_model(prompt + payload, model=model,
+                                                                 temperature=temperature, on_token=on_token)
+    result = parse(raw_content)
+    if cache:
+        cache.put(make_key(kind, PROMPT_VERSION, served, {"temperature": temperature}, payload), raw_content)
+    return result
+
+def parse_quiz(raw_content: str) -> dict:
+    data = find_json_object(raw_content)
+    if data is None:
+        raise ValueError("No valid JSON object found in the response.")
+    if "quiz" not in data or "answers" not in data:
+        raise ValueError("Response does not contain 'quiz' and 'answers' keys.")
+    quiz = [str(q).strip() for q in data["quiz"]]
+    answers = [str(a).strip() for a in data["answers"]]
+    if len(quiz) != len(answers):
+        raise ValueError(f"Mismatch between number of questions ({len(quiz)}) and answers ({len(answers)}).")
+    return {"quiz": quiz, "answers": answers}
+
+async def generate_quiz_and_answers_async(text: str, on_token=None) -> dict:
+    try:
+        return await ask_model("quiz", QUIZ_PROMPT, "\n\n" + text, parse_quiz, on_token)
+    except Exception as e:
+        print(f"Error generating quiz: {e}")
+        return None
+
+def generate_quiz_and_answers(text: str, on_token=None) -> dict:
+    return get_engine().run(generate_quiz_and_answers_async(text, on_token))
+
+
+async def quiz_ai_async(text: str, on_token=None) -> str:
+    if not text.strip():
+        raise ValueError("Input text is empty or invalid.")
+    if count_tokens(text) <= QUIZ_SECTION_TOKENS:
+        result = await generate_quiz_and_answers_async(text, on_token)
+    else:
+        result = await quiz_in_sections(split_into_chunks(text, QUIZ_SECTION_TOKENS), on_token)
+    if result is None:
+        raise ValueError("Failed to generate quiz. The file may lack sufficient material.")
+    return format_quiz(result)
+
+def quiz_ai(text: str, on_token=None) -> str:
+    return get_engine().run(quiz_ai_async(text, on_token))
+
+async def quiz_in_sections(sections: list, on_token=None) -> dict:
+    job = Job("quiz", "\n".join(sections), PROMPT_VERSION)
+    result = await quiz_sections(sections, job, on_token)
+    job.finish()
+    return result
+
+async def quiz_section(section: str, on_token=None) -> dict:
+    # Unlike generate_quiz_and_answers_async this raises, so a failed section is never taken for an empty one
+    return await ask_model("quiz", QUIZ_PROMPT, "\n\n" + section, parse_quiz, on_token)
+
+async def quiz_sections(sections: list, job: Job, on_token=None) -> dict:
+    """Quiz each section concurrently (each one checkpointed in job) and merge the questions.
+
+    Raises the first error if every section failed. If only some did, the
+    merged quiz says how many in "missing", out of "sections".
+    """
+    results = await asyncio.gather(
+        *(job.step(section, lambda section=section, i=i: quiz_section(section, on_token if i == 0 else None))
+          for i, section in enumerate(sections)),
+        return_exceptions=True)
+    failures = [r for r in results if isinstance(r, BaseException)]
+    for failure in failures:
+        if not isinstance(failure, Exception):
+            raise failure  # cancelled
+    quizzes = [r for r in results if not isinstance(r, BaseException)]
+    if not quizzes:
+        raise failures[0]
+    result = merge_quizzes(quizzes)
+    if failures:
+        print(f"Error generating quiz for {len(failures)} of {len(sections)} sections: {failures[0]}")
+        result.update(missing=len(failures), sections=len(sections))
+    return result
+
+def merge_quizzes(results: list, limit: int = QUIZ_MAX_QUESTIONS) -> dict:
+    """Take questions round-robin across sections up to limit, then put them back in document order"""
+    if not results:
+        return None
+    picks = [(rank, section, question, answer)
+             for section, result in enumerate(results)
+             for rank, (question, answer) in enumerate(zip(result["quiz"], result["answers"]))]
+    picks.sort(key=lambda p: (p[0], p[1]))
+    picks = sorted(picks[:limit], key=lambda p: (p[1], p[0]))
+    return {"quiz": [p[2] for p in picks], "answers": [p[3] for p in picks]}
+
+def report_cleanup(filepath: str, stats: CleanupStats):
+    # Paged formats only: the repeated headers and footers stripped from the prompt
+    if stats.pages:
+        print(stats.report(os.path.basename(filepath)))
+
+async def read_sections(filepath: str, max_tokens: int, small_limit: int, stats: CleanupStats = None):
+    """Sections of a file, or its whole text as one string if it is no longer than small_limit tokens"""
+    chunks = chunk_records(iter_prompt_records(filepath, stats), max_tokens)
+    done = object()
+    sections = []
+    total = 0
+    while (chunk := await asyncio.to_thread(next, chunks, done)) is not done:
+        sections.append(chunk)
+        total += count_tokens(chunk)
+        if total > small_limit:
+            return sections, chunks
+    return "\n".join(sections), None
+
+async def quiz_ai_from_file_async(filepath: str, on_token=None) -> str:
+    """Quiz a file in one call, or per QUIZ_SECTION_TOKENS section if it is longer"""
+    stats = CleanupStats()
+    records = await asyncio.to_thread(list, iter_prompt_records(filepath, stats))
+    report_cleanup(filepath, stats)
+    sections = list(chunk_records(records, QUIZ_SECTION_TOKENS))
+    if len(sections) <= 1:
+        return await quiz_ai_async("\n".join(sections), on_token)
+    return format_quiz(await quiz_in_sections(sections, on_token))
+
+def quiz_ai_from_file(filepath: str, on_token=None) -> str:
+    return get_engine().run(quiz_ai_from_file_async(filepath, on_token))
+
+def format_quiz(result: dict) -> str:
+    quiz = result.get("quiz", [])
+    answers = result.get("answers", [])
+    if not quiz or not answers or len(quiz) != len(answers):
+        raise ValueError("Invalid quiz data: missing or mismatched questions and answers.")
+    formatted_output = []
+    if result.get("missing"):
+        formatted_output.append(f"Note: {result['missing']} of {result['sections']} sections of the document "
+                                "could not be quizzed; generate the quiz again to cover them.")
+    for i, question in enumerate(quiz, 1):
+        cleaned_question = re.sub(r'^Question\s*\d+:\s*', '', question, flags=re.IGNORECASE).strip()
+        formatted_output.append(f"{i}. Question: {cleaned_question}")
+    formatted_output.append("Answers:")
+    for i, answer in enumerate(answers, 1):
+        cleaned_answer = re.sub(r'^Answer\s*\d+:\s*', '', answer, flags=re.IGNORECASE).strip()
+        formatted_output.append(f"{i}. Answer: {cleaned_answer}")
+    return "\n".join(formatted_output)
+
+
+def parse_notes(raw_content: str) -> str:
+    data = find_json_object(raw_content)
+    if data is None:
+        raise ValueError("No valid JSON object found in the response.")
+    if "notes" not in data:
+        raise ValueError("Response does not contain 'notes' key.")
+    notes = [str(n).strip() for n in data["notes"]]
+    if not notes:
+        raise ValueError("No notes generated.")
+    return "\n\n".join(notes)
+
+async def notes_ai_async(text: str, on_token=None) -> str:
+    if count_tokens(text) <= CHUNK_TOKENS:
+        return await ask_model("notes", NOTES_PROMPT, "\n\n" + text, parse_notes, on_token)
+    # Map: summarize every chunk concurrently (bounded by the engine's semaphore)
+    job = Job("notes", text, PROMPT_VERSION)
+    partial_notes = await asyncio.gather(
+        *(summarize_chunk(chunk, job) for chunk in split_into_chunks(text, CHUNK_TOKENS)))
+    notes = await reduce_notes(list(partial_notes), job, on_token)
+    job.finish()
+    return notes
+
+async def summarize_chunk(chunk: str, job: Job) -> str:
+    return await job.step(chunk, lambda: ask_model("notes", NOTES_PROMPT, "\n\n" + chunk, parse_notes))
+
+async def reduce_notes(partial_notes: list, job: Job, on_token=None) -> str:
+    """Merge partial notes level by level until a single set is left"""
+    while len(partial_notes) > 1:
+        groups = group_for_reduce(partial_notes, CHUNK_TOKENS)
+        if len(groups) == 1:
+            return await merge_notes(groups[0], job, on_token)
+        partial_notes = await asyncio.gather(*(merge_notes(group, job) for group in groups))
+    return partial_notes[0]
+
+async def merge_notes(group: list, job: Job, on_token=None) -> str:
+    if len(group) == 1:
+        return group[0]
+    payload = "\n\n" + "\n\n---\n\n".join(group)
+    return await job.step(payload, lambda: ask_model("notes-merge", MERGE_NOTES_PROMPT, payload,
+                                                     parse_notes, on_token))
+
+def notes_ai(text: str, on_token=None) -> str:
+    return get_engine().run(notes_ai_async(text, on_token))
+
+async def notes_ai_from_file_async(filepath: str, on_token=None) -> str:
+    """Notes for a file, starting on the first chunks while later pages are still being parsed"""
+    stats = CleanupStats()
+    sections, rest = await read_sections(filepath, CHUNK_TOKENS, CHUNK_TOKENS, stats)
+    if rest is None:
+        report_cleanup(filepath, stats)
+        return await notes_ai_async(sections, on_token)
+    # Keyed by the file's bytes: the sections are still being read when the first ones are sent
+    job = Job("notes", await asyncio.to_thread(file_digest, filepath), PROMPT_VERSION)
+    tasks = [asyncio.ensure_future(summarize_chunk(chunk, job)) for chunk in sections]
+    done = object()
+    while (chunk := await asyncio.to_thread(next, rest, done)) is not done:
+        tasks.append(asyncio.ensure_future(summarize_chunk(chunk, job)))
+    report_cleanup(filepath, stats)
+    notes = await reduce_notes(list(await asyncio.gather(*tasks)), job, on_token)
+    job.finish()
+    return notes
+
+def notes_ai_from_file(filepath: str, on_token=None) -> str:
+    return get_engine().run(notes_ai_from_file_async(filepath, on_token))
+
+
+def parse_mnemonics(raw_content: str) -> list:
+    data = find_json_object(raw_content)
+    if data is None:
+        raise ValueError("No valid JSON object found in the response.")
+    if "mnemonics" not in data:
+        raise ValueError("Response does not contain 'mnemonics' key.")
+    mnemonics = [str(m).strip() for m in data["mnemonics"]]
+    if not mnemonics:
+        raise ValueError("No mnemonics generated.")
+    return mnemonics
+
+def normalize_word(word: str) -> str:
+    return " ".join(word.split()).casefold()
+
+def match_mnemonics(words: list, mnemonics: list) -> dict:
+    """Map each normalized word to its "Word: ... - Mnemonic: ..." entry"""
+    matched = {}
+    for entry in mnemonics:
+        m = re.match(r'^\s*Word:\s*(.+?)\s+-\s+Mnemonic:', entry, flags=re.IGNORECASE)
+        if m:
+            matched[normalize_word(m.group(1))] = entry
+    wanted = [normalize_word(w) for w in words]
+    if not any(w in matched for w in wanted) and len(mnemonics) == len(words):
+        # The model ignored the format; fall back to answer order
+        matched = dict(zip(wanted, mnemonics))
+    return {w: matched[w] for w in wanted if w in matched}
+
+# Shown for a word the model still leaves out after being asked for it again
+NO_MNEMONIC = "(no mnemonic returned)"
+
+async def request_mnemonics(words: list) -> tuple:
+    """Ask the model for mnemonics for words.
+
+    Returns ({normalized word: entry} for the ones it answered, model that answered).
+    """
+    raw_content, served = await get_engine().complete_with_model(
+        MNEMONICS_PROMPT + "\n\nWords: " + ", ".join(words), model=DEFAULT_MODEL, temperature=0.7)
+    return match_mnemonics(words, parse_mnemonics(raw_content)), served
+
+async def mnemonics_ai_async(words: list) -> str:
     if not words:
         return ""
-    response = client.chat.completions.create(
-        model="meta-llama/llama-4-maverick:free",
-        messages=[{"role": "user", "content": prompt + "\n\nWords: " + ", ".join(words)}],
-        temperature=0.7
-    )
-    raw_content = response.choices[0].message.content.strip()
-    json_str = extract_json_string(raw_content)
-    if json_str:
-        data = json.loads(json_str)
-        if not isinstance(data, dict) or "story" not in data:
+    # Mnemonics are memoized per word, so only words never seen before go to the model
+    cache = get_cache()
+    params = {"temperature": 0.7}
+    found = {}
+    missing = []
+    seen = set()
+    for word in words:
+        norm = normalize_word(word)
+        if norm in seen:
+            continue
+        seen.add(norm)
+        cached = cache.get(make_key("mnemonic-word", PROMPT_VERSION, DEFAULT_MODEL, params, norm)) if cache else None
+        if cached is None:
+            missing.append(word)
+        else:
+            found[norm] = cached
+    # Words the model leaves out are asked for once more on their own
+    for attempt in range(2):
+        if not missing:
+            break
+        try:
+            fresh, served = await request_mnemonics(missing)
+        except ValueError:
+            if attempt == 0:
+                raise
+            break  # nothing usable the second time either; the words are marked below
+        for norm, entry in fresh.items():
+            if cache:
+                cache.put(make_key("mnemonic-word", PROMPT_VERSION, served, params, norm), entry)
+            found[norm] = entry
+        missing = [word for word in missing if normalize_word(word) not in fresh]
+    if not found:
+        raise ValueError("No mnemonics generated.")
+    # Merge back in the order the words were entered, marking any the model never answered
+    ordered = []
+    for word in words:
+        norm = normalize_word(word)
+        if norm not in seen:
+            continue
+        seen.discard(norm)
+        ordered.append(found.get(norm, f"Word: {word} - Mnemonic: {NO_MNEMONIC}"))
+    return "\n\n".join(ordered)
+
+def mnemonics_ai(words: list) -> str:
+    return get_engine().run(mnemonics_ai_async(words))
+
+
+def parse_story(raw_content: str) -> str:
+    data = find_json_object(raw_content)
+    if data is not None:
+        if "story" not in data:
             raise ValueError("Response does not contain 'story' key.")
         story = str(data["story"]).strip()
-        if not story and words:
+        if not story:
             raise ValueError("No story generated.")
         return story
     else:
         if raw_content and len(raw_content) > 50:
             return raw_content.strip()
         raise ValueError("No valid story content found in the response.")
+
+async def story_ai_async(words: list, on_token=None) -> str:
+    if not words:
+        return ""
+    return await ask_model("story", STORY_PROMPT, "\n\nWords: " + ", ".join(words), parse_story, on_token)
+
+def story_ai(words: list, on_token=None) -> str:
+    return get_engine().run(story_ai_async(words, on_token))
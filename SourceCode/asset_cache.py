@@ -0,0 +1,95 @@
+import os
+import io
+import json
+from response_cache import CACHE_DIR
+from extraction_cache import file_digest
+
+# Every background is shown on the 800x600 canvas
+DISPLAY_SIZE = (800, 600)
+BUNDLE_PATH = os.path.join(CACHE_DIR, "backgrounds.bundle")
+# Bump when the bundle layout or the conversion changes
+BUNDLE_MAGIC = b"BRAMBLE-ASSETS 1\n"
+
+
+def read_header(f):
+    """Bundle entries from the start of an open bundle, or None if it is not a bundle.
+
+    The bundle is the magic line, a JSON header line mapping each source path
+    to its size, mtime, content hash and (offset, length), then the images.
+    Offsets count from the end of the header, where f is left.
+    """
+    if f.readline() != BUNDLE_MAGIC:
+        return None
+    try:
+        return json.loads(f.readline())
+    except ValueError:
+        return None
+
+
+def _is_current(path: str, entry: dict) -> bool:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+    if st.st_size == entry["size"] and st.st_mtime_ns == entry["mtime_ns"]:
+        return True
+    # Touched but maybe not changed (a fresh checkout): the content hash decides
+    return st.st_size == entry["size"] and file_digest(path) == entry["sha256"]
+
+
+def load_backgrounds(paths: list, bundle_path: str = BUNDLE_PATH) -> dict:
+    """{path: PPM bytes} for every path the bundle holds an up-to-date copy of.
+
+    Only the header and the images asked for are read, so loading one page's
+    background costs one image, not the whole bundle.
+    """
+    images = {}
+    try:
+        with open(bundle_path, "rb") as f:
+            entries = read_header(f)
+            if entries is None:
+                return {}
+            start = f.tell()
+            for path in paths:
+                entry = entries.get(path)
+                if entry and _is_current(path, entry):
+                    f.seek(start + entry["offset"])
+                    images[path] = f.read(entry["length"])
+    except OSError:
+        return {}
+    return images
+
+
+def convert(path: str, size=DISPLAY_SIZE) -> bytes:
+    """The image at path scaled to size, as binary PPM, which Tk loads without any decoding library"""
+    from PIL import Image
+    with Image.open(path) as image:
+        image = image.convert("RGB")
+        if image.size != size:
+            image = image.resize(size, Image.LANCZOS)
+        out = io.BytesIO()
+        image.save(out, format="PPM")
+    return out.getvalue()
+
+
+def build_bundle(paths: list, bundle_path: str = BUNDLE_PATH):
+    """Convert every image in paths and write them to one bundle file"""
+    entries = {}
+    blobs = []
+    offset = 0
+    for path in paths:
+        st = os.stat(path)
+        blob = convert(path)
+        entries[path] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": file_digest(path),
+                         "offset": offset, "length": len(blob)}
+        blobs.append(blob)
+        offset += len(blob)
+    os.makedirs(os.path.dirname(bundle_path), exist_ok=True)
+    # Write a temporary file and rename it, so a half-written bundle is never read
+    temp = f"{bundle_path}.{os.getpid()}.tmp"
+    with open(temp, "wb") as f:
+        f.write(BUNDLE_MAGIC)
+        f.write(json.dumps(entries).encode("utf-8") + b"\n")
+        for blob in blobs:
+            f.write(blob)
+    os.replace(temp, bundle_path)
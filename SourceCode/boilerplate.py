@@ -0,0 +1,111 @@
+import re
+from chunking import count_tokens
+
+# Pages buffered before the first one is released; repeated lines are judged on these
+WARMUP_PAGES = 12
+# A line is boilerplate once it is on at least this share of the pages seen...
+REPEAT_SHARE = 0.5
+# ...and on at least this many pages
+MIN_REPEATS = 3
+# Headers, footers and page numbers are short; longer lines are never stripped
+MAX_LINE_CHARS = 120
+# Only this many non-blank lines at the top and bottom of a page are candidates,
+# so templated body lines ("Example 3:") are left alone. Pages with no more
+# than twice this many lines have no separate edges and are never stripped.
+EDGE_LINES = 3
+
+# The only numbers ignored when matching lines: "Page 3", "Slide 3 of 40", "3 / 40"
+# or a number standing alone, so table rows and dated lines still differ
+_PAGE_NUMBER = re.compile(r"\b(?:page|slide|p\.)\s*\d+(?:\s*(?:of|/)\s*\d+)?\b"
+                          r"|^\W*\d+(?:\s*(?:of|/)\s*\d+)?\W*$")
+_SPACES = re.compile(r"[ \t ]+")
+_HYPHEN_BREAK = re.compile(r"(\w)-\n[ \t]*([a-z])")
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+
+def line_key(line: str):
+    """Hash of a line with case, spacing and page numbers ignored, so "Page 3 of 40" matches "Page 4 of 40" """
+    line = line.strip()
+    if not line or len(line) > MAX_LINE_CHARS:
+        return None
+    return hash(_SPACES.sub(" ", _PAGE_NUMBER.sub("#", line.lower())))
+
+
+def edge_lines(lines: list) -> set:
+    """Positions of the first and last EDGE_LINES non-blank lines, or none on a short page"""
+    filled = [i for i, line in enumerate(lines) if line.strip()]
+    if len(filled) <= 2 * EDGE_LINES:
+        return set()
+    return set(filled[:EDGE_LINES] + filled[-EDGE_LINES:])
+
+
+def clean_text(text: str) -> str:
+    """Rejoin words hyphenated across lines and squeeze runs of spaces and blank lines"""
+    text = _HYPHEN_BREAK.sub(r"\1\2", text)
+    text = "\n".join(_SPACES.sub(" ", line).strip() for line in text.split("\n"))
+    return _BLANK_LINES.sub("\n\n", text).strip()
+
+
+class CleanupStats:
+    def __init__(self):
+        self.pages = 0
+        self.lines_removed = 0
+        self.tokens_before = 0
+        self.tokens_after = 0
+
+    def report(self, name: str) -> str:
+        saved = self.tokens_before - self.tokens_after
+        share = 100 * saved / self.tokens_before if self.tokens_before else 0
+        return (f"{name}: removed {self.lines_removed} repeated lines from {self.pages} pages, "
+                f"{self.tokens_before} -> {self.tokens_after} tokens ({share:.0f}% fewer)")
+
+
+def strip_boilerplate(records, stats: CleanupStats = None):
+    """Yield (index, text) pages with repeated headers/footers removed and whitespace cleaned.
+
+    Lines at the top and bottom of each page are counted by line_key(). The
+    first WARMUP_PAGES pages are held back so there is something to compare
+    against; after that each page is released as soon as it arrives, judged
+    on every page seen so far.
+    Pass stats to read the lines removed and the token reduction once the
+    document is done; showing them is up to the caller.
+    """
+    stats = stats if stats is not None else CleanupStats()
+    counts = {}
+    held = []
+
+    def release(index, text):
+        kept = []
+        lines = text.split("\n")
+        edges = edge_lines(lines)
+        for i, line in enumerate(lines):
+            key = line_key(line) if i in edges else None
+            if (key is None or counts.get(key, 0) < MIN_REPEATS
+                    or counts[key] < REPEAT_SHARE * stats.pages):
+                kept.append(line)
+        cleaned = clean_text("\n".join(kept))
+        if not cleaned and text.strip():
+            # Everything on the page looked repeated; keep it rather than lose the page
+            cleaned = clean_text(text)
+        else:
+            stats.lines_removed += len(lines) - len(kept)
+        stats.tokens_before += count_tokens(text)
+        stats.tokens_after += count_tokens(cleaned)
+        return index, cleaned
+
+    for index, text in records:
+        stats.pages += 1
+        lines = text.split("\n")
+        for key in {line_key(lines[i]) for i in edge_lines(lines)} - {None}:
+            counts[key] = counts.get(key, 0) + 1
+        if held is not None:
+            held.append((index, text))
+            if len(held) < WARMUP_PAGES:
+                continue
+            pages, held = held, None
+            for page in pages:
+                yield release(*page)
+            continue
+        yield release(index, text)
+    for page in held or ():
+        yield release(*page)
@@ -0,0 +1,124 @@
+import re
+import hashlib
+
+# Keeps a chunk plus the notes prompt comfortably inside a free-tier context window
+DEFAULT_CHUNK_TOKENS = 6000
+
+_encoding = None
+
+
+def _get_encoding():
+    # tiktoken is optional and slow to import, so it is looked for on the first count
+    global _encoding
+    if _encoding is None:
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        except ImportError:
+            _encoding = False
+    return _encoding
+
+
+def count_tokens(text: str) -> int:
+    """Token count of text: exact with tiktoken installed, otherwise ~4 characters per token"""
+    encoding = _get_encoding()
+    if encoding:
+        return len(encoding.encode(text, disallowed_special=()))
+    return (len(text) + 3) // 4
+
+
+def _split_oversized(piece: str, max_tokens: int) -> list:
+    # Fall back from paragraphs to sentences, and from sentences to raw slices
+    sentences = re.split(r'(?<=[.!?])\s+', piece)
+    if len(sentences) > 1:
+        return sentences
+    size = max(1, len(piece) * max_tokens // max(1, count_tokens(piece)))
+    return [piece[i:i + size] for i in range(0, len(piece), size)]
+
+
+def ends_section(text: str, tokens: int, section_tokens: int, max_tokens: int) -> bool:
+    """Content-defined boundary: whether a section may close after this piece.
+
+    Decided by the piece's own hash, with odds proportional to its size,
+    rather than by how much text came before it. Editing one page therefore
+    only moves the boundaries next to it; every other section keeps its exact
+    text, and so its cached reply. Sections land between 1/4 of max_tokens
+    and max_tokens; a larger minimum would mean fewer sections, but one edit
+    could then shift every boundary after it.
+    """
+    if section_tokens < max_tokens // 4:
+        return False
+    digest = int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "big")
+    return digest % 1000000 < 1000000 * tokens * 2 // max_tokens
+
+
+def _pack(pieces, max_tokens: int):
+    # Group (text, tokens) pieces at content-defined boundaries, never past max_tokens
+    current = []
+    current_tokens = 0
+    for piece, tokens in pieces:
+        if current and current_tokens + tokens > max_tokens:
+            yield current
+            current, current_tokens = [], 0
+        current.append(piece)
+        current_tokens += tokens
+        if ends_section(piece, tokens, current_tokens, max_tokens):
+            yield current
+            current, current_tokens = [], 0
+    if current:
+        yield current
+
+
+def split_into_chunks(text: str, max_tokens: int = DEFAULT_CHUNK_TOKENS) -> list:
+    """Split text into chunks of at most max_tokens, breaking on paragraph and sentence boundaries"""
+    pending = [p for p in re.split(r'\n\s*\n', text) if p.strip()]
+    pending.reverse()
+
+    def pieces():
+        while pending:
+            piece = pending.pop()
+            tokens = count_tokens(piece)
+            if tokens > max_tokens:
+                pending.extend(reversed(_split_oversized(piece, max_tokens)))
+                continue
+            yield piece, tokens
+
+    return ["\n\n".join(group) for group in _pack(pieces(), max_tokens)]
+
+
+def chunk_records(records, max_tokens: int = DEFAULT_CHUNK_TOKENS):
+    """Pack a stream of (index, text) records into chunks, yielding each chunk as soon as it is closed"""
+    def pieces():
+        for _, text in records:
+            if not text.strip():
+                continue
+            tokens = count_tokens(text)
+            if tokens > max_tokens:
+                # A single huge page or slide: split it on its own
+                for part in split_into_chunks(text, max_tokens):
+                    yield part, count_tokens(part)
+                continue
+            yield text, tokens
+
+    for group in _pack(pieces(), max_tokens):
+        yield "\n".join(group)
+
+
+def group_for_reduce(parts: list, max_tokens: int = DEFAULT_CHUNK_TOKENS) -> list:
+    """Group consecutive parts at content-defined boundaries within max_tokens; every group but the last has at least two parts"""
+    groups = []
+    current = []
+    current_tokens = 0
+    for part in parts:
+        tokens = count_tokens(part)
+        if len(current) >= 2 and current_tokens + tokens > max_tokens:
+            groups.append(current)
+            current, current_tokens = [], 0
+        current.append(part)
+        current_tokens += tokens
+        if len(current) >= 2 and ends_section(part, tokens, current_tokens, max_tokens):
+            groups.append(current)
+            current, current_tokens = [], 0
+    if current:
+        groups.append(current)
+    return groups
@@ -0,0 +1,162 @@
+import os
+import zipfile
+import threading
+import xml.etree.ElementTree as ET
+import ooxml
+import text_reader
+from boilerplate import strip_boilerplate, clean_text
+from extraction_cache import get_extraction_cache
+
+# PDFs shorter than this are read on the calling thread; process start-up isn't worth it
+PARALLEL_MIN_PAGES = 48
+# Pages handed to a worker process at a time
+PAGES_PER_TASK = 16
+EXTRACT_WORKERS = int(os.getenv("BRAMBLE_EXTRACT_WORKERS", "0")) or os.cpu_count() or 1
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _get_pool(workers):
+    # Pools are kept for reuse so repeated extractions don't pay process start-up again
+    with _pools_lock:
+        # Two worker threads extracting at once must not each start a pool
+        if workers not in _pools:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            # Never fork: the GUI and the LLM engine run background threads
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            _pools[workers] = ProcessPoolExecutor(max_workers=workers,
+                                                  mp_context=multiprocessing.get_context(method))
+        return _pools[workers]
+
+
+def _pdf_pages(filepath: str, start: int, stop: int) -> list:
+    # Runs in a worker process, which opens its own copy of the document
+    import fitz
+    with fitz.open(filepath) as doc:
+        return [doc[i].get_text() for i in range(start, stop)]
+
+
+def iter_pdf_pages(filepath: str, workers: int = None):
+    """Yield the text of each PDF page in order, reading page ranges in parallel for long documents.
+
+    At most two ranges per worker are in flight, so memory stays bounded
+    no matter how many pages the document has.
+    """
+    import fitz  # PyMuPDF is only loaded once a PDF is opened
+    workers = workers or EXTRACT_WORKERS
+    with fitz.open(filepath) as doc:
+        page_count = doc.page_count
+        if page_count < PARALLEL_MIN_PAGES or workers < 2:
+            for page in doc:
+                yield page.get_text()
+            return
+    pool = _get_pool(workers)
+    ranges = [(start, min(start + PAGES_PER_TASK, page_count))
+              for start in range(0, page_count, PAGES_PER_TASK)]
+    pending = []
+    next_range = 0
+    while pending or next_range < len(ranges):
+        while next_range < len(ranges) and len(pending) < 2 * workers:
+            start, stop = ranges[next_range]
+            pending.append(pool.submit(_pdf_pages, filepath, start, stop))
+            next_range += 1
+        yield from pending.pop(0).result()
+
+
+SUPPORTED_EXTENSIONS = ('.txt', '.csv', '.pdf', '.docx', '.pptx')
+# Plain text is read straight from disk in constant memory; caching it would only hold a copy
+UNCACHED_EXTENSIONS = ('.txt', '.csv')
+# Formats whose records are pages, where running headers and footers repeat
+PAGED_EXTENSIONS = ('.pdf', '.pptx')
+
+
+def iter_docx_paragraphs_object_model(filepath: str):
+    """Body paragraphs via python-docx (the slower path ooxml replaced; kept for benchmarks)"""
+    import docx
+    for para in docx.Document(filepath).paragraphs:
+        yield para.text
+
+
+def iter_pptx_slides_object_model(filepath: str):
+    """Slide text via python-pptx (the slower path ooxml replaced; kept for benchmarks)"""
+    from pptx import Presentation
+    prs = Presentation(filepath)
+    for slide in prs.slides:
+        text_runs = []
+        for shape in slide.shapes:
+            if hasattr(shape, "text"):
+                text_runs.append(shape.text)
+        yield "\n".join(text_runs)
+
+
+def _iter_ooxml(records, filepath):
+    try:
+        yield from records
+    except (zipfile.BadZipFile, KeyError, ET.ParseError) as e:
+        raise ValueError(f"Could not read {os.path.basename(filepath)}: {e}")
+
+
+def iter_document(filepath: str):
+    """Yield (index, text) records as the document is parsed.
+
+    Records are PDF pages, DOCX paragraphs, PPTX slides, or blocks of TXT
+    lines or CSV rows, exactly as extracted.
+    Files extracted before are served from the extraction cache.
+    """
+    if not os.path.isfile(filepath):
+        raise ValueError("File does not exist.")
+    ext = os.path.splitext(filepath)[-1].lower()
+    if ext not in SUPPORTED_EXTENSIONS:
+        raise ValueError("Unsupported file format")
+    cache = None if ext in UNCACHED_EXTENSIONS else get_extraction_cache()
+    if cache is None:
+        yield from enumerate(_parse_document(filepath))
+        return
+    cached, content_hash = cache.lookup(filepath)
+    if cached is not None:
+        yield from enumerate(cached)
+        return
+    records = []
+    for text in _parse_document(filepath):
+        records.append(text)
+        yield len(records) - 1, text
+    # Only reached when the caller consumed the whole document
+    cache.store(filepath, records, content_hash)
+
+
+def _parse_document(filepath: str):
+    ext = os.path.splitext(filepath)[-1].lower()
+    if ext == '.txt':
+        records = text_reader.iter_txt_records(filepath)
+    elif ext == '.csv':
+        records = text_reader.iter_csv_records(filepath)
+    elif ext == '.pdf':
+        records = iter_pdf_pages(filepath)
+    elif ext == '.docx':
+        records = _iter_ooxml(ooxml.iter_docx_paragraphs(filepath), filepath)
+    elif ext == '.pptx':
+        records = _iter_ooxml(ooxml.iter_pptx_slides(filepath), filepath)
+    else:
+        raise ValueError("Unsupported file format")
+    return records
+
+
+def iter_prompt_records(filepath: str, stats=None):
+    """iter_document() cleaned up for prompting.
+
+    Pages and slides lose headers, footers and page numbers that repeat
+    across the document (counted in stats, a boilerplate.CleanupStats, if
+    given); every format gets whitespace and hyphenation fixed.
+    """
+    records = iter_document(filepath)
+    if os.path.splitext(filepath)[-1].lower() in PAGED_EXTENSIONS:
+        yield from strip_boilerplate(records, stats)
+        return
+    for index, text in records:
+        yield index, clean_text(text)
+
+
+def extract_text_from_file(filepath: str, stats=None) -> str:
+    return "\n".join(text for _, text in iter_prompt_records(filepath, stats))
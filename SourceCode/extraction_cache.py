@@ -0,0 +1,121 @@
+import os
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+import threading
+from response_cache import CACHE_DIR, CACHE_ENABLED
+
+# Compressed size of cached extractions before least-recently-used ones are evicted
+MAX_EXTRACT_BYTES = int(os.getenv("BRAMBLE_EXTRACT_CACHE_MAX_MB", "256")) * 1024 * 1024
+# Bump whenever extraction output changes so stale text is not served
+EXTRACTOR_VERSION = 2
+
+
+def file_digest(filepath: str) -> str:
+    """SHA-256 of the file's bytes, read in 1 MB blocks"""
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """Extracted document records, zlib-compressed in SQLite.
+
+    Files are recognised by (path, size, mtime) first, so an unchanged file
+    is found without reading it. Otherwise the file is hashed and looked up
+    by content, which also catches renamed or re-downloaded copies.
+    """
+    def __init__(self, path=None, max_bytes=MAX_EXTRACT_BYTES):
+        if path is None:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            path = os.path.join(CACHE_DIR, "extractions.sqlite3")
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._db:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS files (
+                    path TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    content_hash TEXT NOT NULL
+                )""")
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS extracts (
+                    content_hash TEXT PRIMARY KEY,
+                    version INTEGER NOT NULL,
+                    data BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    last_used REAL NOT NULL
+                )""")
+            self._db.execute("CREATE INDEX IF NOT EXISTS extracts_last_used ON extracts(last_used)")
+
+    def lookup(self, filepath: str):
+        """Return (records, content_hash); records is None on a miss"""
+        path = os.path.abspath(filepath)
+        st = os.stat(path)
+        with self._lock:
+            row = self._db.execute("SELECT content_hash FROM files WHERE path = ? AND size = ? AND mtime_ns = ?",
+                                   (path, st.st_size, st.st_mtime_ns)).fetchone()
+        content_hash = row[0] if row else file_digest(path)
+        with self._lock, self._db:
+            found = self._db.execute("SELECT data FROM extracts WHERE content_hash = ? AND version = ?",
+                                     (content_hash, EXTRACTOR_VERSION)).fetchone()
+            if found is None:
+                return None, content_hash
+            self._db.execute("UPDATE extracts SET last_used = ? WHERE content_hash = ?", (time.time(), content_hash))
+            if row is None:
+                self._remember(path, st, content_hash)
+        return json.loads(zlib.decompress(found[0]).decode("utf-8")), content_hash
+
+    def store(self, filepath: str, records: list, content_hash: str = None):
+        """Cache the records extracted from filepath"""
+        path = os.path.abspath(filepath)
+        st = os.stat(path)
+        content_hash = content_hash or file_digest(path)
+        data = zlib.compress(json.dumps(records).encode("utf-8"), 6)
+        with self._lock, self._db:
+            self._db.execute("INSERT OR REPLACE INTO extracts VALUES (?, ?, ?, ?, ?)",
+                             (content_hash, EXTRACTOR_VERSION, data, len(data), time.time()))
+            self._remember(path, st, content_hash)
+            self._evict()
+
+    def _remember(self, path, st, content_hash):
+        self._db.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)",
+                         (path, st.st_size, st.st_mtime_ns, content_hash))
+
+    def _evict(self):
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM extracts").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        target = total - int(self.max_bytes * 0.9)
+        freed = 0
+        doomed = []
+        for content_hash, size in self._db.execute("SELECT content_hash, size FROM extracts ORDER BY last_used"):
+            if freed >= target:
+                break
+            doomed.append((content_hash,))
+            freed += size
+        self._db.executemany("DELETE FROM extracts WHERE content_hash = ?", doomed)
+        self._db.execute("DELETE FROM files WHERE content_hash NOT IN (SELECT content_hash FROM extracts)")
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_extraction_cache():
+    """Return the process-wide extraction cache, or None when caching is disabled"""
+    global _cache
+    if not CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = ExtractionCache()
+        return _cache
@@ -0,0 +1,191 @@
+import os
+import sqlite3
+import datetime
+
+# Name of the database file inside the history folder
+HISTORY_DB_NAME = "history.db"
+# Entries shown per page of the history view
+PAGE_SIZE = 100
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    created TEXT NOT NULL,
+    action TEXT NOT NULL,
+    content TEXT NOT NULL,
+    source TEXT UNIQUE
+);
+CREATE INDEX IF NOT EXISTS entries_created ON entries (created);
+CREATE INDEX IF NOT EXISTS entries_action ON entries (action);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+# Full-text index over action and content. It holds only the index (the text
+# stays in entries) and the triggers keep it in step with every insert,
+# delete and update, one row at a time.
+SEARCH_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(
+    action, content, content='entries', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS entries_fts_insert AFTER INSERT ON entries BEGIN
+    INSERT INTO entries_fts (rowid, action, content) VALUES (new.id, new.action, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS entries_fts_delete AFTER DELETE ON entries BEGIN
+    INSERT INTO entries_fts (entries_fts, rowid, action, content) VALUES ('delete', old.id, old.action, old.content);
+END;
+CREATE TRIGGER IF NOT EXISTS entries_fts_update AFTER UPDATE ON entries BEGIN
+    INSERT INTO entries_fts (entries_fts, rowid, action, content) VALUES ('delete', old.id, old.action, old.content);
+    INSERT INTO entries_fts (rowid, action, content) VALUES (new.id, new.action, new.content);
+END;
+"""
+# Bump when SEARCH_SCHEMA changes, so existing databases rebuild their index
+SEARCH_VERSION = 1
+
+
+def parse_history_file(filepath: str):
+    """(created, action, content) from a file written by the old save_result_to_file"""
+    with open(filepath, encoding="utf-8", errors="replace") as f:
+        created = f.readline().strip()
+        action = f.readline().strip()
+        f.readline()  # ----- separator
+        f.readline()  # blank line
+        content = f.read()
+    try:
+        datetime.datetime.strptime(created, TIMESTAMP_FORMAT)
+    except ValueError:
+        raise ValueError(f"{os.path.basename(filepath)} is not a history file")
+    if action.startswith("Action: "):
+        action = action[len("Action: "):]
+    return created, action, content
+
+
+def match_query(text: str) -> str:
+    """An FTS5 query matching entries that contain every word of text.
+
+    Each word is quoted, so quotes and operators typed by the user are
+    searched for rather than parsed, and the last word also matches as a
+    prefix, so results show up while a word is still being typed.
+    """
+    words = text.split()
+    if not words:
+        raise ValueError("Empty search")
+    terms = ['"' + word.replace('"', '""') + '"' for word in words]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+class HistoryStore:
+    """Saved results in one SQLite database instead of one text file per action.
+
+    Entries are listed newest first, a page at a time: page() takes the
+    (created, id) of the last row already shown and returns the next rows
+    from the created index, so each page costs the same however long the
+    history gets. The database runs in WAL mode, so an insert is a single
+    append to the log. search() looks words up in an FTS5 index that
+    triggers update as entries are added.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        # With WAL, NORMAL only risks the last commits on power loss, never corruption
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._create_search_index()
+
+    def _create_search_index(self):
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version == SEARCH_VERSION:
+            return
+        with self.conn:
+            self.conn.execute("DROP TABLE IF EXISTS entries_fts")
+            for trigger in ("insert", "delete", "update"):
+                self.conn.execute(f"DROP TRIGGER IF EXISTS entries_fts_{trigger}")
+        self.conn.executescript(SEARCH_SCHEMA)
+        with self.conn:
+            # Index the entries saved before the index existed
+            self.conn.execute("INSERT INTO entries_fts (entries_fts) VALUES ('rebuild')")
+            self.conn.execute(f"PRAGMA user_version = {SEARCH_VERSION}")
+
+    def add(self, action: str, content: str, created: str = None) -> int:
+        """Save one result and return its id"""
+        created = created or datetime.datetime.now().strftime(TIMESTAMP_FORMAT)
+        with self.conn:
+            cursor = self.conn.execute("INSERT INTO entries (created, action, content) VALUES (?, ?, ?)",
+                                       (created, action, content))
+        return cursor.lastrowid
+
+    def page(self, after=None, limit: int = PAGE_SIZE, action: str = None) -> list:
+        """Up to limit (id, created, action) rows, newest first, following the row key after.
+
+        after is the (created, id) of the last row of the previous page, or
+        None for the first page; action restricts the rows to one action.
+        """
+        where, params = [], []
+        if after is not None:
+            where.append("(created, id) < (?, ?)")
+            params.extend(after)
+        if action is not None:
+            where.append("action = ?")
+            params.append(action)
+        sql = "SELECT id, created, action FROM entries"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY created DESC, id DESC LIMIT ?"
+        return self.conn.execute(sql, params + [limit]).fetchall()
+
+    def search(self, text: str, limit: int = PAGE_SIZE) -> list:
+        """Up to limit (id, created, action, snippet) rows containing every word of text, best match first"""
+        return self.conn.execute(
+            "SELECT entries.id, entries.created, entries.action,"
+            " snippet(entries_fts, 1, '[', ']', '...', 12)"
+            " FROM entries_fts JOIN entries ON entries.id = entries_fts.rowid"
+            " WHERE entries_fts MATCH ? ORDER BY rank LIMIT ?",
+            (match_query(text), limit)).fetchall()
+
+    def get(self, entry_id: int):
+        """(created, action, content) of one entry, or None"""
+        return self.conn.execute("SELECT created, action, content FROM entries WHERE id = ?",
+                                 (entry_id,)).fetchone()
+
+    def count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def clear(self) -> int:
+        """Delete every entry and return how many there were"""
+        with self.conn:
+            return self.conn.execute("DELETE FROM entries").rowcount
+
+    def import_folder(self, folder: str) -> int:
+        """Copy the .txt files of an old history folder into the store, once per folder.
+
+        The files are left where they are. Returns how many were imported.
+        """
+        key = "imported:" + os.path.abspath(folder)
+        if self.conn.execute("SELECT 1 FROM meta WHERE key = ?", (key,)).fetchone():
+            return 0
+        try:
+            names = sorted(n for n in os.listdir(folder) if n.endswith(".txt"))
+        except FileNotFoundError:
+            names = []
+        rows = []
+        for name in names:
+            try:
+                rows.append((*parse_history_file(os.path.join(folder, name)), name))
+            except (OSError, ValueError) as e:
+                print(f"Skipping history file {name}: {e}")
+        with self.conn:
+            # source is unique, so a file is never imported twice even if the marker was lost
+            imported = self.conn.executemany(
+                "INSERT OR IGNORE INTO entries (created, action, content, source) VALUES (?, ?, ?, ?)",
+                rows).rowcount
+            self.conn.execute("INSERT INTO meta (key, value) VALUES (?, ?)",
+                              (key, datetime.datetime.now().strftime(TIMESTAMP_FORMAT)))
+        if imported:
+            print(f"Imported {imported} history files from {folder}")
+        return imported
+
+    def close(self):
+        self.conn.close()
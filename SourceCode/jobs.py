@@ -0,0 +1,101 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from response_cache import CACHE_DIR, make_key
+
+# Checkpoints of unfinished multi-step generations
+JOBS_DIR = os.path.join(CACHE_DIR, "jobs")
+# Checkpoints untouched for this long belong to abandoned jobs and are deleted
+MAX_JOB_AGE = 7 * 24 * 3600
+
+_pruned = False
+_prune_lock = threading.Lock()
+
+
+def prune_jobs(folder: str = JOBS_DIR, max_age: float = MAX_JOB_AGE):
+    """Delete checkpoints of jobs nobody came back to"""
+    try:
+        names = os.listdir(folder)
+    except FileNotFoundError:
+        return
+    cutoff = time.time() - max_age
+    for name in names:
+        path = os.path.join(folder, name)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+        except OSError:
+            pass
+
+
+class Job:
+    """A multi-step generation (chunk summaries, merges, quiz sections) that survives restarts.
+
+    The job id is derived from its kind, the prompt version and its source
+    (the input text or the file's content hash), so re-running the same
+    request finds the same checkpoint. Each step is keyed by the hash of its
+    input; its parsed result is written to disk as soon as it arrives, and a
+    resumed job returns it instead of calling the model again. The
+    checkpoint is deleted once the job finishes with every step done, and
+    kept if any step failed so the next run only redoes the missing ones.
+    """
+    def __init__(self, kind: str, source: str, version=0, folder: str = JOBS_DIR):
+        global _pruned
+        with _prune_lock:
+            if not _pruned:
+                _pruned = True
+                prune_jobs(folder)
+        self.kind = kind
+        self.id = make_key(kind, version, "", {}, source)
+        self.folder = folder
+        self.path = os.path.join(folder, self.id + ".json")
+        self.results = self._load()
+        self.failed = 0  # steps that raised or returned nothing in this run
+        if self.results:
+            print(f"Resuming {kind} job: {len(self.results)} steps already done")
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f).get("results", {})
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        # Write a temporary file and rename it, so a crash mid-write leaves the previous checkpoint
+        os.makedirs(self.folder, exist_ok=True)
+        temp = f"{self.path}.{os.getpid()}.{id(self)}.tmp"
+        with open(temp, "w", encoding="utf-8") as f:
+            json.dump({"kind": self.kind, "updated": time.time(), "results": self.results}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp, self.path)
+
+    async def step(self, text: str, make):
+        """Result of the step whose input is text; make() returns the awaitable that computes it"""
+        key = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        if key in self.results:
+            return self.results[key]
+        try:
+            result = await make()
+        except BaseException:
+            self.failed += 1
+            raise
+        if result is None:
+            self.failed += 1
+        else:
+            self.results[key] = result
+            self._save()
+        return result
+
+    def finish(self):
+        """Drop the checkpoint if every step succeeded; the final result is the caller's to keep"""
+        if self.failed:
+            print(f"Keeping {self.kind} job checkpoint: {self.failed} steps failed and will be retried next time")
+            return
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,215 @@
+import re
+import json
+
+# Characters that matter while inside an object, and while inside a string
+_STRUCTURE = re.compile(r'[{}"]')
+_STRING_END = re.compile(r'["\\]')
+# How many times finish() may restart after a stray "{" in the surrounding prose
+MAX_RESCANS = 16
+
+
+class JsonObjectScanner:
+    """Finds the first valid top-level JSON object in text fed piece by piece.
+
+    Only braces and string delimiters are examined and every character is
+    visited once, so a reply of n characters is scanned in O(n) whether it
+    arrives whole or as a token stream. Braces and quotes inside strings
+    are handled, and nested objects/arrays need no special casing.
+    """
+    def __init__(self):
+        self.result = None
+        self.text = None
+        self._pieces = []         # text fed since _offset, kept only while a candidate is open
+        self._offset = 0          # absolute position of the first kept piece
+        self._fed = 0             # absolute position of the end of the input so far
+        self._start = None        # absolute position of the open "{" of the current candidate
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._opens = []          # absolute positions of unclosed "{" inside the candidate
+        self._closed = []         # maximal balanced sub-objects, tried if the candidate never closes
+
+    def feed(self, text: str):
+        """Consume more text; return the object once one has been found"""
+        if self.result is None and text:
+            self._pieces.append(text)
+            base = self._fed
+            self._fed += len(text)
+            self._scan(text, base)
+        return self.result
+
+    def finish(self):
+        """Signal end of input; return the object or None"""
+        rescans = 0
+        while self.result is None and self._start is not None:
+            # The candidate never closed, e.g. a stray "{" in prose before the real JSON
+            for start, end in self._closed:
+                if self._try(start, end):
+                    return self.result
+            rest = self._slice(self._start + 1, self._fed)
+            if rescans == MAX_RESCANS or "}" not in rest:
+                break
+            rescans += 1
+            offset = self._start + 1
+            self.__init__()
+            self._offset = self._fed = offset
+            self.feed(rest)
+        return self.result
+
+    def _scan(self, piece, base):
+        i = 0
+        n = len(piece)
+        while i < n:
+            if self._escape:
+                self._escape = False
+                i += 1
+            elif self._in_string:
+                m = _STRING_END.search(piece, i)
+                if not m:
+                    return
+                i = m.end()
+                if m.group() == "\\":
+                    self._escape = True
+                else:
+                    self._in_string = False
+            elif self._depth == 0:
+                i = piece.find("{", i)
+                if i < 0:
+                    # Nothing before the next "{" is worth keeping
+                    self._pieces = []
+                    self._offset = self._fed
+                    return
+                self._start = base + i
+                self._depth = 1
+                i += 1
+            else:
+                m = _STRUCTURE.search(piece, i)
+                if not m:
+                    return
+                i = m.end()
+                char = m.group()
+                if char == '"':
+                    self._in_string = True
+                elif char == "{":
+                    self._depth += 1
+                    self._opens.append(base + i - 1)
+                elif self._depth > 1:
+                    self._depth -= 1
+                    self._record_closed(self._opens.pop(), base + i)
+                else:
+                    self._depth = 0
+                    if self._try(self._start, base + i):
+                        return
+                    # Not JSON; drop it and keep looking after it
+                    self._start = None
+                    self._opens = []
+                    self._closed = []
+                    self._pieces = [piece[i:]]
+                    self._offset = base + i
+
+    def _record_closed(self, start, end):
+        # Keep only outermost sub-objects; anything inside the new one is covered by it
+        while self._closed and self._closed[-1][0] > start:
+            self._closed.pop()
+        self._closed.append((start, end))
+
+    def _slice(self, start, end):
+        if len(self._pieces) > 1:
+            self._pieces = ["".join(self._pieces)]
+        return self._pieces[0][start - self._offset:end - self._offset]
+
+    def _try(self, start, end):
+        candidate = self._slice(start, end)
+        try:
+            value = json.loads(candidate)
+        except ValueError:
+            return False
+        if not isinstance(value, dict):
+            return False
+        self.result = value
+        self.text = candidate
+        return True
+
+
+def find_json_object(response_str: str):
+    """Return the first valid top-level JSON object in response_str as a dict, or None"""
+    scanner = JsonObjectScanner()
+    if scanner.feed(response_str) is None:
+        scanner.finish()
+    return scanner.result
+
+
+def extract_json_string(response_str: str):
+    """Return the text of the first valid top-level JSON object in response_str, or None"""
+    scanner = JsonObjectScanner()
+    if scanner.feed(response_str) is None:
+        scanner.finish()
+    return scanner.text
+
+
+_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+
+class JsonTextStreamer:
+    """Turns a streamed JSON reply into readable text as it arrives.
+
+    Decoded string values are passed to on_text as soon as their characters
+    arrive; object keys and JSON punctuation are dropped, and consecutive
+    values are separated by a blank line.
+    """
+    def __init__(self, on_text):
+        self.on_text = on_text
+        self._containers = []     # "{" or "[" for each open container
+        self._expect_key = False
+        self._in_string = False
+        self._is_key = False
+        self._escape = ""         # pending escape sequence, may span feeds
+        self._emitted = False
+
+    def feed(self, text: str):
+        out = []
+        for char in text:
+            if self._in_string:
+                if self._escape:
+                    self._escape += char
+                    decoded = self._decode_escape()
+                    if decoded is not None and not self._is_key:
+                        out.append(decoded)
+                elif char == "\\":
+                    self._escape = "\\"
+                elif char == '"':
+                    self._in_string = False
+                    if not self._is_key:
+                        self._emitted = True
+                elif not self._is_key:
+                    out.append(char)
+            elif char == '"' and self._containers:
+                self._in_string = True
+                self._is_key = self._containers[-1] == "{" and self._expect_key
+                if not self._is_key and self._emitted:
+                    out.append("\n\n")
+            elif char in "{[":
+                self._containers.append(char)
+                self._expect_key = char == "{"
+            elif char in "}]":
+                if self._containers:
+                    self._containers.pop()
+            elif char == ":":
+                self._expect_key = False
+            elif char == ",":
+                self._expect_key = bool(self._containers) and self._containers[-1] == "{"
+        if out:
+            self.on_text("".join(out))
+
+    def _decode_escape(self):
+        seq = self._escape
+        if seq[1] == "u":
+            if len(seq) < 6:
+                return None
+            self._escape = ""
+            try:
+                return chr(int(seq[2:6], 16))
+            except ValueError:
+                return ""
+        self._escape = ""
+        return _ESCAPES.get(seq[1], seq[1])
@@ -0,0 +1,202 @@
+import os
+import asyncio
+import threading
+from dotenv import load_dotenv
+from resilience import (CircuitBreaker, MAX_ATTEMPTS, backoff_delay, fallback_models,
+                        is_retryable, retry_after, status_of)
+from rate_limiter import AdaptiveRateLimiter
+
+# Load environment variables
+load_dotenv()
+
+DEFAULT_MODEL = "meta-llama/llama-4-maverick:free"
+BASE_URL = os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")
+# How many model requests may be in flight at once across the whole process
+MAX_CONCURRENCY = int(os.getenv("BRAMBLE_MAX_CONCURRENCY", "8"))
+
+
+class LLMEngine:
+    """Async OpenRouter client with a bounded number of concurrent requests.
+
+    The engine owns one event loop running on a daemon thread. Coroutines
+    from any other loop or thread are bounced onto it, so every caller
+    shares a single HTTP connection pool and a single concurrency limit.
+    """
+    def __init__(self, api_key=None, base_url=BASE_URL, max_concurrency=MAX_CONCURRENCY):
+        self.api_key = api_key or os.getenv("OPENROUTER_API_KEY")
+        self.base_url = base_url
+        self.max_concurrency = max_concurrency
+        self._loop = None
+        self._client = None
+        self._semaphore = None
+        self._lock = threading.Lock()
+        self.breakers = {}
+        # One limiter for every call this engine makes: the quota is per API key
+        self.limiter = AdaptiveRateLimiter()
+        # Running totals of answered requests and the tokens the provider reported for them
+        self.usage = {"requests": 0, "prompt_tokens": 0, "completion_tokens": 0}
+
+    @property
+    def loop(self):
+        """The engine's event loop, started on first use"""
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=self._loop.run_forever,
+                                          name="bramble-llm-loop", daemon=True)
+                thread.start()
+        return self._loop
+
+    def submit(self, coro):
+        """Schedule a coroutine on the engine loop and return a concurrent Future"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro):
+        """Run a coroutine on the engine loop and block until it finishes"""
+        if self._on_engine_loop():
+            coro.close()
+            raise RuntimeError("LLMEngine.run() cannot block the engine's own loop; await instead.")
+        return self.submit(coro).result()
+
+    def run_all(self, coros):
+        """Run several coroutines concurrently; exceptions are returned in place of results"""
+        async def gather():
+            return await asyncio.gather(*coros, return_exceptions=True)
+        return self.run(gather())
+
+    def _on_engine_loop(self):
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+    def _ensure_client(self):
+        # Created lazily on the engine loop so the HTTP pool binds to it
+        if self._client is None:
+            # Imported here: the SDK takes longer to import than the rest of the app put together
+            from openai import AsyncOpenAI
+            self._client = AsyncOpenAI(base_url=self.base_url, api_key=self.api_key,
+                                       max_retries=0)  # retries are handled in complete()
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._client
+
+    async def complete(self, prompt: str, model: str = DEFAULT_MODEL, temperature: float = 0.7,
+                       on_token=None) -> str:
+        """Send a single-message chat completion and return the stripped reply text"""
+        reply, _ = await self.complete_with_model(prompt, model, temperature, on_token)
+        return reply
+
+    async def complete_with_model(self, prompt: str, model: str = DEFAULT_MODEL, temperature: float = 0.7,
+                                  on_token=None) -> tuple:
+        """Send a single-message chat completion and return (reply text, model that wrote it).
+
+        Throttling and server errors are retried with jittered exponential
+        backoff (honouring Retry-After), then the next model in the fallback
+        list is tried. Models whose circuit breaker is open are skipped.
+
+        If on_token is given the reply is streamed and on_token(text) is called
+        with each fragment as it arrives (on the engine thread). A stream that
+        fails after output has started is not retried.
+        """
+        if not self._on_engine_loop():
+            return await asyncio.wrap_future(
+                self.submit(self.complete_with_model(prompt, model, temperature, on_token)))
+        self._ensure_client()
+        last_error = None
+        for candidate in fallback_models(model):
+            breaker = self.breakers.setdefault(candidate, CircuitBreaker())
+            for attempt in range(MAX_ATTEMPTS):
+                if not breaker.allow():
+                    break
+                streamed = []
+                settled = False
+                try:
+                    reply = await self._request(prompt, candidate, temperature, on_token, streamed)
+                    breaker.record_success()
+                    settled = True
+                    return reply, candidate
+                except Exception as e:
+                    if status_of(e) == 429:
+                        self.limiter.on_throttle(retry_after(e))
+                    if not is_retryable(e):
+                        raise
+                    breaker.record_failure()
+                    settled = True
+                    if streamed:
+                        raise
+                    last_error = e
+                    print(f"Model {candidate} failed ({e}); attempt {attempt + 1} of {MAX_ATTEMPTS}")
+                    if attempt + 1 < MAX_ATTEMPTS and not breaker.is_open:
+                        await asyncio.sleep(backoff_delay(attempt, e))
+                    continue
+                finally:
+                    if not settled:
+                        # A client error (bad request, auth) or cancellation says nothing about the
+                        # model's health, but must still end a half-open trial or the model stays blocked
+                        breaker.release()
+        if last_error is None:
+            raise RuntimeError("All models are temporarily unavailable; try again shortly.")
+        raise last_error
+
+    async def _request(self, prompt, model, temperature, on_token, streamed):
+        messages = [{"role": "user", "content": prompt}]
+        await self.limiter.acquire()
+        async with self._semaphore:
+            if on_token is None:
+                raw = await self._client.chat.completions.with_raw_response.create(
+                    model=model,
+                    messages=messages,
+                    temperature=temperature
+                )
+                self.limiter.on_success(raw.headers)
+                response = raw.parse()
+                self._record_usage(response.usage)
+                return (response.choices[0].message.content or "").strip()
+            stream = await self._client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                stream=True,
+                stream_options={"include_usage": True}
+            )
+            self.limiter.on_success(stream.response.headers)
+            usage = None
+            async for chunk in stream:
+                usage = getattr(chunk, "usage", None) or usage
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    streamed.append(delta)
+                    on_token(delta)
+            self._record_usage(usage)
+        return "".join(streamed).strip()
+
+    def _record_usage(self, usage):
+        self.usage["requests"] += 1
+        if usage is not None:
+            self.usage["prompt_tokens"] += usage.prompt_tokens or 0
+            self.usage["completion_tokens"] += usage.completion_tokens or 0
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_engine() -> LLMEngine:
+    """Return the process-wide engine, creating it on first use"""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = LLMEngine()
+        return _engine
+
+
+def configure(max_concurrency: int = None, api_key: str = None, base_url: str = None) -> LLMEngine:
+    """Replace the process-wide engine with one using the given settings"""
+    global _engine
+    with _engine_lock:
+        _engine = LLMEngine(api_key=api_key,
+                            base_url=base_url or BASE_URL,
+                            max_concurrency=max_concurrency or MAX_CONCURRENCY)
+        return _engine
@@ -5,7 +5,9 @@ from PIL import Image, ImageTk
 import os
 import sys
 import datetime
+import time
 import traceback
+from history_store import HistoryStore, HISTORY_DB_NAME, PAGE_SIZE
 
 # Define the history folder location here for easy modification
 HISTORY_FOLDER = r"C:\Users\uaser\Desktop\HISTORY"
@@ -28,6 +30,16 @@ class StudyApp(tk.Tk):
         else:
             print(f"History folder exists at: {HISTORY_FOLDER}")
         
+        # Saved results live in one database in the history folder
+        try:
+            self.store = HistoryStore(os.path.join(HISTORY_FOLDER, HISTORY_DB_NAME))
+            # Bring in the one-file-per-action history written by older versions
+            self.store.import_folder(HISTORY_FOLDER)
+        except Exception as e:
+            messagebox.showerror("Error", f"Could not open history database, history will not be kept: {e}")
+            print(f"Error opening history database: {e}")
+            self.store = HistoryStore(":memory:")
+        
         # Create a container frame
         self.container = tk.Frame(self)
         self.container.pack(fill="both", expand=True)
@@ -55,38 +67,27 @@ class StudyApp(tk.Tk):
         frame.tkraise()
     
     def add_to_history(self, action, content=""):
-        """Add an action to the history and save to file"""
+        """Add an action to the history and save it to the history database"""
         timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         self.history.append(f"{timestamp}: {action}")
         
-        # Save to file
+        # Save to the database
         if content:
-            self.save_result_to_file(action, content)
+            self.save_result(action, content)
         else:
-            # Even if no content, save the action to file
-            self.save_result_to_file(action, f"Action performed: {action}")
+            # Even if no content, save the action
+            self.save_result(action, f"Action performed: {action}")
         
         # Update history page
         self.frames[HistoryPage].update_history()
     
-    def save_result_to_file(self, action, content):
-        """Save the result content to a file in the history folder"""
-        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        # Remove any characters that might cause filename issues
-        safe_action = ''.join(c for c in action if c.isalnum() or c in ' _-')
-        filename = f"{timestamp}_{safe_action.replace(' ', '_')}.txt"
-        filepath = os.path.join(HISTORY_FOLDER, filename)
-        
+    def save_result(self, action, content):
+        """Save the result content to the history database"""
         try:
-            print(f"Saving history to: {filepath}")
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(f"{datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write(f"Action: {action}\n")
-                f.write("-" * 50 + "\n\n")
-                f.write(content)
-            print(f"Successfully saved history file")
+            entry_id = self.store.add(action, content)
+            print(f"Saved history entry {entry_id}")
         except Exception as e:
-            error_msg = f"Could not save history file: {e}\n{traceback.format_exc()}"
+            error_msg = f"Could not save history entry: {e}\n{traceback.format_exc()}"
             print(error_msg)
             messagebox.showerror("Error", error_msg)
     
@@ -423,6 +424,16 @@ class HistoryPage(BackgroundFrame):
         self.history_frame = tk.Frame(self.canvas, bg="white", bd=1, relief="solid")
         history_frame_window = self.canvas.create_window(400, 288, window=self.history_frame, width=600, height=300)
         
+        # Search box above the history list; Enter searches, an empty search shows everything again
+        self.search_var = tk.StringVar()
+        search_entry = tk.Entry(self.canvas, textvariable=self.search_var, font=("Arial", 12), width=45)
+        search_entry.bind("<Return>", lambda e: self.update_history())
+        search_entry_window = self.canvas.create_window(345, 118, window=search_entry)
+        search_button = tk.Button(self.canvas, text="SEARCH", font=("Arial", 10),
+                             width=10, bg="#87CEEB",
+                             command=self.update_history)
+        search_button_window = self.canvas.create_window(645, 118, window=search_button)
+        
         # Text widget for displaying history (instead of Listbox)
         self.history_text = tk.Text(self.history_frame, font=("Arial", 12), 
                                 wrap="word", padx=10, pady=10)
@@ -448,58 +459,61 @@ class HistoryPage(BackgroundFrame):
                             command=self.clear_history)
         clear_button_window = self.canvas.create_window(700, 542, window=clear_button)
         
+        # Show older entries, a page at a time (bottom middle)
+        self.more_button = tk.Button(self.canvas, text="MORE", font=("Arial", 10),
+                                width=13, height=2, bg="#87CEEB",
+                                command=self.show_more)
+        more_button_window = self.canvas.create_window(400, 542, window=self.more_button)
+        
+        # Reading a page from the database is cheap, so show the saved history right away
+        self.update_history()
     
     def update_history(self):
-        """Update the history display by reading files from the history folder"""
+        """Show the newest page of history, or the results of the search typed in the search box"""
         self.history_text.config(state="normal")
         self.history_text.delete(1.0, "end")
-        
+        self.history_text.config(state="disabled")
+        self.last_key = None
+        self.shown = 0
+        if self.search_var.get().strip():
+            self.show_search(self.search_var.get())
+        else:
+            self.show_more()
+    
+    def show_search(self, query):
+        """Show the saved results matching query, best match first"""
+        self.history_text.config(state="normal")
         try:
-            print(f"Reading history from folder: {HISTORY_FOLDER}")
-            
-            # Check if directory exists
-            if not os.path.exists(HISTORY_FOLDER):
-                self.history_text.insert("end", f"History folder not found at: {HISTORY_FOLDER}\n")
-                print(f"History folder not found: {HISTORY_FOLDER}")
-                try:
-                    os.makedirs(HISTORY_FOLDER)
-                    self.history_text.insert("end", "Created new history folder.")
-                    print("Created new history folder")
-                except Exception as create_err:
-                    self.history_text.insert("end", f"Failed to create history folder: {create_err}")
-                    print(f"Failed to create history folder: {create_err}")
-                self.history_text.config(state="disabled")
-                return
-            
-            # Get all text files from the history folder
-            history_files = [f for f in os.listdir(HISTORY_FOLDER) if f.endswith('.txt')]
-            print(f"Found {len(history_files)} history files")
-            
-            if not history_files:
+            start = time.perf_counter()
+            rows = self.controller.store.search(query)
+            print(f"Search for {query!r}: {len(rows)} results in {(time.perf_counter() - start) * 1000:.1f} ms")
+            if not rows:
+                self.history_text.insert("end", "No history items match your search.")
+            for i, (entry_id, created, action, snippet) in enumerate(rows):
+                snippet = " ".join(snippet.split())
+                self.history_text.insert("end", f"{i+1}. {created} | Action: {action}\n    {snippet}\n\n")
+        except Exception as e:
+            error_msg = f"Error searching history: {e}\n{traceback.format_exc()}"
+            self.history_text.insert("end", error_msg)
+            print(error_msg)
+        # Search shows the best PAGE_SIZE matches only
+        self.more_button.config(state="disabled")
+        self.history_text.config(state="disabled")
+    
+    def show_more(self):
+        """Append the next page of older entries to the history display"""
+        self.history_text.config(state="normal")
+        try:
+            rows = self.controller.store.page(after=self.last_key, limit=PAGE_SIZE)
+            if not rows and self.shown == 0:
                 self.history_text.insert("end", "No history items found.")
-            else:
-                history_files.sort(reverse=True)  # Most recent first
-                for i, file in enumerate(history_files):
-                    file_path = os.path.join(HISTORY_FOLDER, file)
-                    print(f"Reading history file: {file_path}")
-                    
-                    try:
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            # Read just the first few lines to display summary
-                            header_lines = []
-                            for _ in range(3):  # Read first 3 lines
-                                line = f.readline().strip()
-                                if line:
-                                    header_lines.append(line)
-                        
-                        entry_text = f"{i+1}. {' | '.join(header_lines)}\n\n"
-                        self.history_text.insert("end", entry_text)
-                        print(f"Added history entry: {entry_text.strip()}")
-                    except Exception as file_err:
-                        error_msg = f"Error reading file {file}: {file_err}"
-                        self.history_text.insert("end", f"{error_msg}\n\n")
-                        print(error_msg)
-        
+            for entry_id, created, action in rows:
+                self.shown += 1
+                self.history_text.insert("end", f"{self.shown}. {created} | Action: {action}\n\n")
+            if rows:
+                self.last_key = (rows[-1][1], rows[-1][0])
+            # A short page means there is nothing older
+            self.more_button.config(state="normal" if len(rows) == PAGE_SIZE else "disabled")
         except Exception as e:
             error_msg = f"Error loading history: {e}\n{traceback.format_exc()}"
             self.history_text.insert("end", error_msg)
@@ -508,28 +522,24 @@ class HistoryPage(BackgroundFrame):
         self.history_text.config(state="disabled")
     
     def clear_history(self):
-        """Clear the history by deleting all text files in the history folder"""
+        """Clear the history database and any old history files in the history folder"""
         if messagebox.askyesno("Confirm", "Are you sure you want to clear all history?"):
             try:
-                print("Clearing history files...")
-                file_count = 0
-                
-                # Check if directory exists
-                if not os.path.exists(HISTORY_FOLDER):
-                    messagebox.showinfo("Info", "No history folder found.")
-                    return
+                print("Clearing history...")
+                entry_count = self.controller.store.clear()
                 
-                for filename in os.listdir(HISTORY_FOLDER):
-                    filepath = os.path.join(HISTORY_FOLDER, filename)
-                    if os.path.isfile(filepath) and filename.endswith('.txt'):
-                        print(f"Deleting file: {filepath}")
-                        os.remove(filepath)
-                        file_count += 1
+                # Files left over from before the history database
+                if os.path.exists(HISTORY_FOLDER):
+                    for filename in os.listdir(HISTORY_FOLDER):
+                        filepath = os.path.join(HISTORY_FOLDER, filename)
+                        if os.path.isfile(filepath) and filename.endswith('.txt'):
+                            print(f"Deleting file: {filepath}")
+                            os.remove(filepath)
                 
                 self.controller.history = []
                 self.update_history()
-                messagebox.showinfo("Success", f"Cleared {file_count} history files.")
-                print(f"Successfully cleared {file_count} history files")
+                messagebox.showinfo("Success", f"Cleared {entry_count} history entries.")
+                print(f"Successfully cleared {entry_count} history entries")
             except Exception as e:
                 error_msg = f"Could not clear history: {e}\n{traceback.format_exc()}"
                 messagebox.showerror("Error", error_msg)
@@ -1,13 +1,17 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox
 from tkinter import ttk
-from PIL import Image, ImageTk
 import os
 import sys
-from ai_functions import mnemonics_ai, story_ai, quiz_ai, notes_ai
+import time
+from ai_functions import mnemonics_ai, story_ai, quiz_ai_from_file, notes_ai_from_file
+from worker_pool import WorkerPool
+from virtual_list import VirtualList
+import asset_cache
 
 class StudyApp(tk.Tk):
     def __init__(self):
+        self.started = time.perf_counter()
         super().__init__()
         self.title("Study Helper App")
         self.geometry("800x600")
@@ -16,37 +20,112 @@ class StudyApp(tk.Tk):
         self.container = tk.Frame(self)
         self.container.pack(fill="both", expand=True)
         
-        # Dictionary to store our frames
-        self.frames = {}
-        
-        # Create all frames and add them to the dictionary
-        for F in (MainPage, ReviewPage, NewWordsPage, WordEntryPage_Story, WordEntryPage_Mnemonics, ResultsPage, HistoryPage):
-            frame = F(self.container, self)
-            self.frames[F] = frame
-            frame.grid(row=0, column=0, sticky="nsew")
-        
-        # Show the main page first
-        self.show_frame(MainPage)
+        # Background workers for AI calls so the window never freezes
+        self.workers = WorkerPool(self)
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
         
         # Variables to track app state
         self.selected_file = ""
         self.history = []
         self.current_function = ""  # Track which function was selected (Story or Mnemonics)
+        
+        # Pages are built the first time they are shown; decoded backgrounds wait here until then
+        self.frames = {}
+        self.backgrounds = {}
+        # Pre-sized PPM copies of the backgrounds from the asset bundle: only the main page's
+        # before the first frame, the rest on a worker thread once it is up
+        self.background_data = asset_cache.load_backgrounds([asset_path(MainPage.background)])
+        
+        # Show the main page first
+        self.show_frame(MainPage)
+        self.after_idle(self.on_first_frame)
+    
+    def get_frame(self, page_class):
+        """Return the page, building it on first use"""
+        frame = self.frames.get(page_class)
+        if frame is None:
+            frame = page_class(self.container, self)
+            self.frames[page_class] = frame
+            frame.grid(row=0, column=0, sticky="nsew")
+        return frame
     
     def show_frame(self, page_class):
         """Bring the specified frame to the front"""
-        frame = self.frames[page_class]
+        frame = self.get_frame(page_class)
         frame.tkraise()
     
+    def on_first_frame(self):
+        """Report startup time, then read the other pages' backgrounds off the Tk thread"""
+        print(f"First frame after {(time.perf_counter() - self.started) * 1000:.0f} ms")
+        paths = [asset_path(page.background) for page in PAGES]
+        self.workers.submit(asset_cache.load_backgrounds, paths,
+                            on_done=self.store_background_data,
+                            on_error=lambda e: self.prepare_backgrounds({}))
+    
+    def store_background_data(self, images):
+        """Keep the bundled backgrounds of pages not built yet (runs on the Tk thread)"""
+        for page_class in PAGES:
+            path = asset_path(page_class.background)
+            if page_class not in self.frames and path in images:
+                self.background_data.setdefault(path, images[path])
+        self.prepare_backgrounds(images)
+    
+    def prepare_backgrounds(self, bundled):
+        """Decode the backgrounds the bundle lacks and rebuild it for the next launch"""
+        paths = [asset_path(page.background) for page in PAGES]
+        if all(path in bundled for path in paths):
+            return  # everything comes from the bundle, which Tk reads without help
+        for page_class, path in zip(PAGES, paths):
+            if page_class not in self.frames and path not in self.backgrounds and path not in bundled:
+                self.workers.submit(decode_background, path,
+                                    on_done=lambda image, path=path: self.store_background(path, image),
+                                    on_error=lambda e: None)  # the page decodes it again when shown
+        # Missing or out of date: rebuild the bundle so the next launch can skip decoding
+        self.workers.submit(asset_cache.build_bundle, paths,
+                            on_error=lambda e: print(f"Could not build the background bundle: {e}"))
+    
+    def store_background(self, path, image):
+        """Turn a decoded background into a Tk image (runs on the Tk thread)"""
+        from PIL import ImageTk
+        self.backgrounds.setdefault(path, ImageTk.PhotoImage(image))
+    
+    def background_image(self, path):
+        """Tk image for a page background: from the bundle, predecoded, or decoded now"""
+        data = self.background_data.pop(path, None)
+        if data is None and path not in self.backgrounds:
+            # Shown before the worker got to it: read just this entry of the bundle
+            data = asset_cache.load_backgrounds([path]).get(path)
+        if data is not None:
+            return tk.PhotoImage(data=data, format="ppm")
+        image = self.backgrounds.pop(path, None)
+        if image is None:
+            from PIL import ImageTk
+            image = ImageTk.PhotoImage(decode_background(path))
+        return image
+    
+    def on_close(self):
+        """Stop background jobs and close the window"""
+        self.workers.shutdown()
+        self.destroy()
+    
+    def show_error(self, title, error):
+        """Report a failed background job"""
+        messagebox.showerror(title, str(error))
+    
     def add_to_history(self, action):
         """Add an action to the history"""
         self.history.append(f"{action}")
-        # Update history page
-        self.frames[HistoryPage].update_history()
+        # Update history page if it has been built; otherwise it reads the history when it is
+        if HistoryPage in self.frames:
+            self.frames[HistoryPage].history_added()
         
     def select_file(self):
         """Open file dialog and return selected file path"""
         filetypes = (
+            ('Documents', '*.pdf *.docx *.pptx *.txt *.csv'),
+            ('PDF files', '*.pdf'),
+            ('Word documents', '*.docx'),
+            ('PowerPoint presentations', '*.pptx'),
             ('Text files', '*.txt'),
             ('CSV files', '*.csv'),
             ('All files', '*.*')
@@ -59,7 +138,7 @@ class StudyApp(tk.Tk):
         
         if filename:
             self.selected_file = filename
-            self.frames[NewWordsPage].file_label.config(text=os.path.basename(filename))
+            self.get_frame(NewWordsPage).file_label.config(text=os.path.basename(filename))
             self.add_to_history(f"Uploaded file: {os.path.basename(filename)}")
             return filename
         return None
@@ -68,21 +147,40 @@ class StudyApp(tk.Tk):
         """Reset application state when back button is pressed"""
         # Reset selected file
         self.selected_file = ""
-        if hasattr(self.frames[NewWordsPage], 'file_label'):
+        if hasattr(self.frames.get(NewWordsPage), 'file_label'):
             self.frames[NewWordsPage].file_label.config(text="No file selected")
         
         # Reset word entry pages
-        if hasattr(self.frames[WordEntryPage_Story], 'words_text'):
+        if hasattr(self.frames.get(WordEntryPage_Story), 'words_text'):
             self.frames[WordEntryPage_Story].words_text.delete(1.0, "end")
         
-        if hasattr(self.frames[WordEntryPage_Mnemonics], 'words_text'):
+        if hasattr(self.frames.get(WordEntryPage_Mnemonics), 'words_text'):
             self.frames[WordEntryPage_Mnemonics].words_text.delete(1.0, "end")
         
         # Reset current function
         self.current_function = ""
 
+def asset_path(relative_path):
+    """Absolute path of a file shipped next to the app"""
+    if getattr(sys, 'frozen', False):
+        # If running as a bundled executable
+        script_dir = os.path.dirname(sys.executable)
+    else:
+        # If running as a script
+        script_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(script_dir, relative_path)
+
+def decode_background(full_path):
+    """Read and fully decode a background image; safe to run on a worker thread"""
+    from PIL import Image  # only needed when the asset bundle is missing or stale
+    image = Image.open(full_path)
+    image.load()  # Image.open is lazy; decode here rather than on the Tk thread
+    return image
+
 class BackgroundFrame(tk.Frame):
     """Base class for frames with background images"""
+    background = None  # image path relative to the app, set by each page
+    
     def __init__(self, parent, controller, bg_image_path):
         tk.Frame.__init__(self, parent)
         self.controller = controller
@@ -91,21 +189,10 @@ class BackgroundFrame(tk.Frame):
         self.canvas = tk.Canvas(self, width=800, height=600)
         self.canvas.pack(fill="both", expand=True)
         
-        # Get the directory of the current script
-        if getattr(sys, 'frozen', False):
-            # If running as a bundled executable
-            script_dir = os.path.dirname(sys.executable)
-        else:
-            # If running as a script
-            script_dir = os.path.dirname(os.path.abspath(__file__))
-        
-        # Form the full path to the image
-        full_path = os.path.join(script_dir, bg_image_path)
+        full_path = asset_path(bg_image_path)
         
         try:
-            # Try to load the image
-            image = Image.open(full_path)
-            self.bg_image = ImageTk.PhotoImage(image)
+            self.bg_image = controller.background_image(full_path)
             
             # Place the image on the canvas
             self.canvas.create_image(0, 0, image=self.bg_image, anchor="nw")
@@ -115,8 +202,10 @@ class BackgroundFrame(tk.Frame):
             self.canvas.create_rectangle(0, 0, 800, 600, fill="#f0f0f0", outline="")
 
 class MainPage(BackgroundFrame):
+    background = "pics/1.png"
+    
     def __init__(self, parent, controller):
-        BackgroundFrame.__init__(self, parent, controller, "pics/1.png")
+        BackgroundFrame.__init__(self, parent, controller, self.background)
         
         # Review button with rounded corner
         review_button = tk.Button(self.canvas, text="REVIEW", font=("Arial", 18), 
@@ -137,8 +226,10 @@ class MainPage(BackgroundFrame):
         history_button_window = self.canvas.create_window(95, 542, window=history_button)
 
 class ReviewPage(BackgroundFrame):
+    background = "pics/2.png"
+    
     def __init__(self, parent, controller):
-        BackgroundFrame.__init__(self, parent, controller, "pics/2.png")
+        BackgroundFrame.__init__(self, parent, controller, self.background)
         
         # Make Story button
         story_button = tk.Button(self.canvas, text="MAKE STORY", font=("Arial", 18), 
@@ -172,8 +263,10 @@ class ReviewPage(BackgroundFrame):
         back_button_window = self.canvas.create_window(95, 542, window=back_button)
 
 class WordEntryPage_Story(BackgroundFrame):
+    background = "pics/3.png"
+    
     def __init__(self, parent, controller):
-        BackgroundFrame.__init__(self, parent, controller, "pics/3.png")
+        BackgroundFrame.__init__(self, parent, controller, self.background)
         
         # Text area for word entry
         self.words_text = tk.Text(self.canvas, wrap="word", font=("Arial", 12), 
@@ -204,23 +297,33 @@ class WordEntryPage_Story(BackgroundFrame):
         word_list = [word.strip() for word in words.split('\n') if word.strip()]
         
         # Update results page based on function type
-        results_frame = self.controller.frames[ResultsPage]
+        results_frame = self.controller.get_frame(ResultsPage)
+        generation = results_frame.start("Story using your words:\n\n")
+        self.controller.show_frame(ResultsPage)
         
-        # Create story with the entered words
-        story = self.create_story(word_list)
+        # Create story with the entered words on a worker thread, streaming it in as it is written
+        self.controller.workers.submit(
+            self.create_story, word_list, results_frame.stream_callback(generation),
+            on_done=lambda story: self.show_story(story, generation),
+            on_error=lambda e: results_frame.is_current(generation) and self.controller.show_error("Story Failed", e))
+    
+    def show_story(self, story, generation):
+        """Display a finished story unless a newer job has taken the page (runs on the Tk thread)"""
+        results_frame = self.controller.get_frame(ResultsPage)
+        if not results_frame.is_current(generation):
+            return
         results_frame.set_content(f"Story using your words:\n\n{story}")
         self.controller.add_to_history("Generated a story with custom words")
-        
-        # Show results pages.
-        self.controller.show_frame(ResultsPage)
     
-    def create_story(self, words):
-        ai_story_text = story_ai(words)
+    def create_story(self, words, on_token=None):
+        ai_story_text = story_ai(words, on_token)
         return ai_story_text
 
 class WordEntryPage_Mnemonics(BackgroundFrame):
+    background = "pics/4.png"
+    
     def __init__(self, parent, controller):
-        BackgroundFrame.__init__(self, parent, controller, "pics/4.png")
+        BackgroundFrame.__init__(self, parent, controller, self.background)
         
         # Text area for word entry  #11, 50, 308, 300
         self.words_text = tk.Text(self.canvas, wrap="word", font=("Arial", 12), 
@@ -251,15 +354,23 @@ class WordEntryPage_Mnemonics(BackgroundFrame):
         word_list = [word.strip() for word in words.split('\n') if word.strip()]
         
         # Update results page based on function type
-        results_frame = self.controller.frames[ResultsPage]
+        results_frame = self.controller.get_frame(ResultsPage)
+        generation = results_frame.start("Creating mnemonics...")
+        self.controller.show_frame(ResultsPage)
         
-        # Create mnemonics for the entered words
-        mnemonics = self.create_mnemonics(word_list)
-        results_frame.set_content(f"Mnemonics for your words:\{mnemonics}")
+        # Create mnemonics for the entered words on a worker thread
+        self.controller.workers.submit(
+            self.create_mnemonics, word_list,
+            on_done=lambda mnemonics: self.show_mnemonics(mnemonics, generation),
+            on_error=lambda e: results_frame.is_current(generation) and self.controller.show_error("Mnemonics Failed", e))
+    
+    def show_mnemonics(self, mnemonics, generation):
+        """Display finished mnemonics unless a newer job has taken the page (runs on the Tk thread)"""
+        results_frame = self.controller.get_frame(ResultsPage)
+        if not results_frame.is_current(generation):
+            return
+        results_frame.set_content(f"Mnemonics for your words:\n\n{mnemonics}")
         self.controller.add_to_history("Generated mnemonics for custom words")
-        
-        # Show results page
-        self.controller.show_frame(ResultsPage)
     
     def create_mnemonics(self, words):
         """Create simple mnemonics for the provided words"""
@@ -268,8 +379,10 @@ class WordEntryPage_Mnemonics(BackgroundFrame):
         return "".join(result)
 
 class NewWordsPage(BackgroundFrame):
+    background = "pics/6.png"
+    
     def __init__(self, parent, controller):
-        BackgroundFrame.__init__(self, parent, controller, "pics/6.png")
+        BackgroundFrame.__init__(self, parent, controller, self.background)
         
         # File name label
         self.file_label = tk.Label(self.canvas, text="No file selected", font=("Arial", 12), bg="#f0f0f0")
@@ -308,22 +421,36 @@ class NewWordsPage(BackgroundFrame):
             messagebox.showwarning("No File Selected", "Please upload a file first.")
             return
             
-        results_frame = self.controller.frames[ResultsPage]
+        results_frame = self.controller.get_frame(ResultsPage)
+        filepath = self.controller.selected_file
         if function_type == "Quiz":
-            quiz_result = quiz_ai(self.controller.selected_file)
-            results_frame.set_content(quiz_result)
-            self.controller.add_to_history("Created a quiz")
-            
+            generate, action = quiz_ai_from_file, "Created a quiz"
         else:  # Notes
-            notes_result = notes_ai(self.controller.selected_file)
-            results_frame.set_content(notes_result)
-            self.controller.add_to_history("Generated study notes")
-        
+            generate, action = notes_ai_from_file, "Generated study notes"
+        generation = results_frame.start("")
         self.controller.show_frame(ResultsPage)
+        
+        # Parse the file and call the model on a worker thread, streaming the reply in as it arrives
+        self.controller.workers.submit(
+            generate, filepath, results_frame.stream_callback(generation),
+            on_done=lambda result: self.show_generated(result, action, generation),
+            on_error=lambda e: results_frame.is_current(generation) and self.controller.show_error(f"{function_type} Failed", e))
+    
+    def show_generated(self, result, action, generation):
+        """Display a finished quiz or notes unless a newer job has taken the page (runs on the Tk thread)"""
+        results_frame = self.controller.get_frame(ResultsPage)
+        if not results_frame.is_current(generation):
+            return
+        results_frame.set_content(result)
+        self.controller.add_to_history(action)
 
 class ResultsPage(BackgroundFrame):
+    background = "pics/5.png"
+    
     def __init__(self, parent, controller):
-        BackgroundFrame.__init__(self, parent, controller, "pics/5.png")
+        BackgroundFrame.__init__(self, parent, controller, self.background)
+        # Id of the job whose result the page is waiting for; older jobs' results are dropped
+        self.generation = 0
         
         # Create a frame for the content
         content_frame = tk.Frame(self.canvas, bg="white", bd=1, relief="solid")
@@ -347,25 +474,52 @@ class ResultsPage(BackgroundFrame):
                               command=lambda: controller.show_frame(HistoryPage))
         history_button_window = self.canvas.create_window(700, 542, window=history_button)
     
+    def start(self, content):
+        """Show content for a new job and return the job's generation id"""
+        self.generation += 1
+        self.set_content(content)
+        return self.generation
+    
+    def is_current(self, generation):
+        """True if generation belongs to the newest job started on this page"""
+        return generation == self.generation
+    
     def set_content(self, content):
         """Set content for the results page"""
         self.results_text.config(state="normal")
         self.results_text.delete(1.0, "end")
         self.results_text.insert("end", content)
         self.results_text.config(state="disabled")
+    
+    def append_content(self, text, generation):
+        """Append streamed text to the end of the results, unless it is from a replaced job"""
+        if not self.is_current(generation):
+            return
+        self.results_text.config(state="normal")
+        self.results_text.insert("end", text)
+        self.results_text.see("end")
+        self.results_text.config(state="disabled")
+    
+    def stream_callback(self, generation):
+        """Return an on_token callback that worker threads can use to stream the job's text in here"""
+        workers = self.controller.workers
+        return lambda text: workers.post(self.append_content, text, generation)
 
 
 class HistoryPage(BackgroundFrame):
+    background = "pics/7.png"
+    
     def __init__(self, parent, controller):
-        BackgroundFrame.__init__(self, parent, controller, "pics/7.png")
+        BackgroundFrame.__init__(self, parent, controller, self.background)
         
         # Create a frame for the history list
         self.history_frame = tk.Frame(self.canvas, bg="white", bd=1, relief="solid")
         history_frame_window = self.canvas.create_window(400, 288, window=self.history_frame, width=600, height=300)
         
-        # Listbox to display history
-        self.history_list = tk.Listbox(self.history_frame, font=("Arial", 12), 
-                                   height=20, width=70)
+        # Listbox to display history; only the rows on screen are ever in the widget
+        self.history_list = VirtualList(self.history_frame, controller.history,
+                                        format_row=lambda i, item: f"{i+1}. {item}",
+                                        font=("Arial", 12), height=20, width=70)
         self.history_list.pack(fill="both", expand=True, padx=10, pady=10)
         
         # Back button (small, bottom left)  #13, 2, 95, 542
@@ -379,18 +533,26 @@ class HistoryPage(BackgroundFrame):
                             width=13, height=2, bg="#F44336", fg="white",
                             command=self.clear_history)
         clear_button_window = self.canvas.create_window(700, 542, window=clear_button)
+        
+        # Built lazily, so catch up on anything that happened before the page was first shown
+        self.update_history()
     
     def update_history(self):
-        """Update the history listbox"""
-        self.history_list.delete(0, "end")
-        for i, item in enumerate(self.controller.history):
-            self.history_list.insert("end", f"{i+1}. {item}")
+        """Redraw the history listbox from the start"""
+        self.history_list.set_items(self.controller.history)
+    
+    def history_added(self):
+        """Show the entry just appended to the history"""
+        self.history_list.appended()
     
     def clear_history(self):
         """Clear the history"""
         self.controller.history = []
         self.update_history()
 
+# Every page, in the order their backgrounds are decoded after startup
+PAGES = (MainPage, ReviewPage, NewWordsPage, WordEntryPage_Story, WordEntryPage_Mnemonics, ResultsPage, HistoryPage)
+
 if __name__ == "__main__":
     app = StudyApp()
     app.mainloop()
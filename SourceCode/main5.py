@@ -7,7 +7,7 @@ import sys
 from openai import OpenAI
 from dotenv import load_dotenv
 import json
-import re
+from json_stream import extract_json_string as find_json_string
 
 # Load environment variables
 load_dotenv()
@@ -105,9 +105,9 @@ def extract_text_from_file(filepath: str) -> str:
 
 def extract_json_string(response_str):
     """Extract valid JSON string from the response"""
-    json_match = re.search(r'{\s*".*?\}\s*}', response_str, re.DOTALL)
-    if json_match:
-        return json_match.group()
+    json_str = find_json_string(response_str)
+    if json_str:
+        return json_str
     raise ValueError("No valid JSON object found in the response.")
 
 class BackgroundFrame(tk.Frame):
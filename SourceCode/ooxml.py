@@ -0,0 +1,173 @@
+import re
+import zipfile
+import posixpath
+import xml.etree.ElementTree as ET
+
+# Streams text straight out of the XML parts of .docx/.pptx files instead of
+# building python-docx / python-pptx object models. Also picks up tables,
+# grouped shapes and speaker notes, which the object-model path skipped.
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+A = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+P = "{http://schemas.openxmlformats.org/presentationml/2006/main}"
+R = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+NOTES_REL_TYPE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/notesSlide"
+
+
+def _read_rels(archive, part):
+    """Map relationship id -> (type, target part path) for an OOXML part"""
+    folder, name = posixpath.split(part)
+    rels_path = posixpath.join(folder, "_rels", name + ".rels")
+    try:
+        root = ET.fromstring(archive.read(rels_path))
+    except KeyError:
+        return {}
+    rels = {}
+    for rel in root.iter(REL + "Relationship"):
+        target = rel.get("Target", "")
+        if rel.get("TargetMode") != "External":
+            target = posixpath.normpath(posixpath.join(folder, target))
+        rels[rel.get("Id")] = (rel.get("Type", ""), target)
+    return rels
+
+
+class _TextCollector:
+    """Shared paragraph/table bookkeeping for the WordprocessingML and DrawingML walkers.
+
+    Paragraphs outside tables become their own lines; inside a table the
+    paragraphs of a cell are joined with spaces and the cells of a row with
+    tabs, so each table row comes out as one line.
+    """
+    def __init__(self, text_tag, tab_tag, break_tags, para_tag, table_tag, row_tag, cell_tag):
+        self.text_tag = text_tag
+        self.tab_tag = tab_tag
+        self.break_tags = break_tags
+        self.para_tag = para_tag
+        self.table_tag = table_tag
+        self.row_tag = row_tag
+        self.cell_tag = cell_tag
+        self.lines = []
+        self._runs = []
+        self._cells = None
+        self._cell = None
+        self._table_depth = 0
+
+    def start(self, tag):
+        if tag == self.table_tag:
+            self._table_depth += 1
+        elif tag == self.row_tag and self._table_depth == 1:
+            self._cells = []
+        elif tag == self.cell_tag and self._table_depth == 1:
+            self._cell = []
+
+    def end(self, elem):
+        """Handle a closing tag; True when a top-level paragraph or table row was completed"""
+        tag = elem.tag
+        if tag == self.text_tag:
+            self._runs.append(elem.text or "")
+        elif tag == self.tab_tag:
+            self._runs.append("\t")
+        elif tag in self.break_tags:
+            self._runs.append("\n")
+        elif tag == self.para_tag:
+            text = "".join(self._runs)
+            self._runs = []
+            if self._cell is not None:
+                if text:
+                    self._cell.append(text)
+                return False
+            self.lines.append(text)
+            return self._table_depth == 0
+        elif tag == self.cell_tag and self._table_depth == 1 and self._cell is not None:
+            self._cells.append(" ".join(self._cell))
+            self._cell = None
+        elif tag == self.row_tag and self._table_depth == 1 and self._cells is not None:
+            self.lines.append("\t".join(self._cells))
+            self._cells = None
+            return True
+        elif tag == self.table_tag:
+            self._table_depth -= 1
+        return False
+
+    def take(self):
+        lines, self.lines = self.lines, []
+        return lines
+
+
+def iter_docx_paragraphs(filepath: str):
+    """Yield the text of each body paragraph of a .docx, one line per table row"""
+    with zipfile.ZipFile(filepath) as archive:
+        collector = _TextCollector(W + "t", W + "tab", (W + "br", W + "cr"), W + "p",
+                                   W + "tbl", W + "tr", W + "tc")
+        with archive.open("word/document.xml") as xml:
+            for event, elem in ET.iterparse(xml, events=("start", "end")):
+                if event == "start":
+                    collector.start(elem.tag)
+                elif collector.end(elem):
+                    # Finished a top-level paragraph or table row; free its subtree
+                    elem.clear()
+                    yield from collector.take()
+            yield from collector.take()
+
+
+def _slide_order(archive):
+    """Slide part paths in presentation order"""
+    presentation = "ppt/presentation.xml"
+    rels = _read_rels(archive, presentation)
+    root = ET.fromstring(archive.read(presentation))
+    slides = []
+    id_list = root.find(P + "sldIdLst")
+    if id_list is not None:
+        for slide_id in id_list.iter(P + "sldId"):
+            rel = rels.get(slide_id.get(R + "id"))
+            if rel:
+                slides.append(rel[1])
+    if not slides:
+        # No slide list: fall back to the numeric order of the part names
+        names = [n for n in archive.namelist() if re.fullmatch(r"ppt/slides/slide\d+\.xml", n)]
+        slides = sorted(names, key=lambda n: int(re.search(r"(\d+)\.xml$", n).group(1)))
+    return slides
+
+
+def _drawing_text(archive, part):
+    """Every paragraph of a slide-like part, including groups and tables"""
+    # DrawingML keeps tabs as literal characters in a:t, so there is no tab element
+    collector = _TextCollector(A + "t", None, (A + "br",), A + "p", A + "tbl", A + "tr", A + "tc")
+    with archive.open(part) as xml:
+        for event, elem in ET.iterparse(xml, events=("start", "end")):
+            if event == "start":
+                collector.start(elem.tag)
+            else:
+                collector.end(elem)
+    return collector.take()
+
+
+def _notes_text(archive, part):
+    """Speaker notes: only the body placeholder, not the slide image or number"""
+    root = ET.fromstring(archive.read(part))
+    lines = []
+    for shape in root.iter(P + "sp"):
+        placeholder = shape.find(f"{P}nvSpPr/{P}nvPr/{P}ph")
+        if placeholder is None or placeholder.get("type") != "body":
+            continue
+        for para in shape.iter(A + "p"):
+            lines.append("".join("\n" if el.tag == A + "br" else el.text or ""
+                                 for el in para.iter() if el.tag in (A + "t", A + "br")))
+    return "\n".join(lines).strip()
+
+
+def iter_pptx_slides(filepath: str):
+    """Yield the text of each slide of a .pptx, followed by its speaker notes"""
+    with zipfile.ZipFile(filepath) as archive:
+        names = set(archive.namelist())
+        for slide in _slide_order(archive):
+            if slide not in names:
+                continue
+            text = "\n".join(_drawing_text(archive, slide))
+            for rel_type, target in _read_rels(archive, slide).values():
+                if rel_type == NOTES_REL_TYPE and target in names:
+                    notes = _notes_text(archive, target)
+                    if notes:
+                        text += "\nSpeaker notes: " + notes
+            yield text
@@ -0,0 +1,83 @@
+import os
+import time
+import asyncio
+
+# Starting request rate (requests/second) and the bounds AIMD may move it within
+INITIAL_RATE = float(os.getenv("BRAMBLE_RATE_LIMIT", "0.5"))
+MIN_RATE = 0.02
+MAX_RATE = float(os.getenv("BRAMBLE_MAX_RATE", "10"))
+# Requests that may go out back to back before the rate applies
+BURST = 4
+# AIMD: add this much rate per successful request, multiply by this on a 429
+ADDITIVE_STEP = 0.02
+DECREASE_FACTOR = 0.5
+
+
+class AdaptiveRateLimiter:
+    """Token bucket shared by every model call, with an AIMD-adjusted refill rate.
+
+    Each success nudges the rate up additively; a 429 halves it. Several
+    requests in flight usually hit the same limit together, so only one
+    decrease is applied per back-off window. This keeps the rate close to
+    the provider's real limit instead of collapsing on a burst of 429s.
+    Rate-limit headers, when present, cap the rate directly and pause the
+    bucket once the quota is used up.
+    """
+    def __init__(self, rate=INITIAL_RATE, burst=BURST, min_rate=MIN_RATE, max_rate=MAX_RATE):
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.tokens = float(burst)
+        self.blocked_until = 0.0
+        self.throttled = 0
+        self._updated = time.monotonic()
+        self._last_decrease = 0.0
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        """Wait until a request may be sent"""
+        while True:
+            now = time.monotonic()
+            self._refill(now)
+            if now >= self.blocked_until and self.tokens >= 1:
+                self.tokens -= 1
+                return
+            wait = max(self.blocked_until - now, (1 - self.tokens) / self.rate)
+            await asyncio.sleep(wait)
+
+    def on_success(self, headers=None):
+        """Additive increase, bounded by what the rate-limit headers say is left"""
+        self.rate = min(self.max_rate, self.rate + ADDITIVE_STEP)
+        if headers:
+            self._apply_headers(headers)
+
+    def on_throttle(self, retry_after=None):
+        """Multiplicative decrease after a 429, at most once per back-off window"""
+        now = time.monotonic()
+        self.throttled += 1
+        if now - self._last_decrease >= 1 / self.rate:
+            self.rate = max(self.min_rate, self.rate * DECREASE_FACTOR)
+            self._last_decrease = now
+        self.tokens = 0.0
+        if retry_after:
+            self.blocked_until = max(self.blocked_until, now + retry_after)
+
+    def _apply_headers(self, headers):
+        remaining = headers.get("x-ratelimit-remaining")
+        reset = headers.get("x-ratelimit-reset")
+        if remaining is None or reset is None:
+            return
+        try:
+            remaining = float(remaining)
+            # OpenRouter reports the reset time as epoch milliseconds
+            seconds_left = max(0.0, float(reset) / 1000 - time.time())
+        except ValueError:
+            return
+        if remaining <= 0:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds_left)
+        elif seconds_left > 0:
+            self.rate = max(self.min_rate, min(self.rate, remaining / seconds_left))
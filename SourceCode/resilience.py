@@ -0,0 +1,122 @@
+import os
+import time
+import random
+import threading
+from email.utils import parsedate_to_datetime
+
+# Tries per model before moving on to the next one in the fallback list
+MAX_ATTEMPTS = int(os.getenv("BRAMBLE_MAX_ATTEMPTS", "4"))
+BASE_DELAY = 1.0
+MAX_DELAY = 30.0
+# Consecutive failures that open a model's circuit, and how long it stays open
+BREAKER_THRESHOLD = 3
+BREAKER_COOLDOWN = 60.0
+
+RETRYABLE_STATUS = {408, 409, 425, 429}
+
+
+def status_of(error):
+    return getattr(error, "status_code", None)
+
+
+def is_retryable(error) -> bool:
+    """True for throttling, server errors, timeouts and dropped connections"""
+    import openai  # already loaded by the request that raised error
+    if isinstance(error, openai.APIConnectionError):
+        return True
+    status = status_of(error)
+    return status is not None and (status in RETRYABLE_STATUS or status >= 500)
+
+
+def retry_after(error):
+    """Seconds the provider asked us to wait, from Retry-After style headers, or None"""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return float(value) / 1000
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if value:
+        try:
+            return float(value)
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+    value = headers.get("x-ratelimit-reset")
+    if value:
+        try:
+            # OpenRouter sends the reset time as epoch milliseconds
+            return max(0.0, float(value) / 1000 - time.time())
+        except ValueError:
+            pass
+    return None
+
+
+def backoff_delay(attempt: int, error=None) -> float:
+    """Delay before retry number attempt (0-based): Retry-After if given, else full-jitter exponential"""
+    hinted = retry_after(error) if error is not None else None
+    if hinted is not None:
+        return min(hinted, MAX_DELAY)
+    return random.uniform(0, min(MAX_DELAY, BASE_DELAY * 2 ** attempt))
+
+
+class CircuitBreaker:
+    """Stops sending requests to a model after repeated failures.
+
+    After BREAKER_THRESHOLD consecutive failures the circuit opens and the
+    model is skipped for BREAKER_COOLDOWN seconds; then a single trial
+    request is let through (half-open) and its outcome closes or reopens it.
+    """
+    def __init__(self, threshold=BREAKER_THRESHOLD, cooldown=BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at < self.cooldown or self._trial_running:
+                return False
+            self._trial_running = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_running = False
+
+    def release(self):
+        """End a half-open trial without counting it as a success or a failure"""
+        with self._lock:
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._trial_running or self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+            self._trial_running = False
+
+
+def fallback_models(primary: str) -> list:
+    """The requested model followed by the configured fallbacks, without duplicates"""
+    configured = os.getenv("BRAMBLE_FALLBACK_MODELS",
+                           "meta-llama/llama-3.3-70b-instruct:free,deepseek/deepseek-chat-v3-0324:free")
+    models = [primary] + [m.strip() for m in configured.split(",") if m.strip()]
+    return list(dict.fromkeys(models))
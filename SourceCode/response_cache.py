@@ -0,0 +1,123 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+
+# Cache files live next to the app unless BRAMBLE_CACHE_DIR says otherwise
+CACHE_DIR = os.getenv("BRAMBLE_CACHE_DIR",
+                      os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache"))
+# Total size of cached replies before least-recently-used entries are evicted
+MAX_CACHE_BYTES = int(os.getenv("BRAMBLE_CACHE_MAX_MB", "64")) * 1024 * 1024
+# Set BRAMBLE_CACHE=0 to always call the model
+CACHE_ENABLED = os.getenv("BRAMBLE_CACHE", "1") != "0"
+
+
+def make_key(kind: str, version, model: str, params: dict, text: str) -> str:
+    """Content address of a request: hash of generator, prompt version, model, params and input"""
+    header = json.dumps([kind, version, model, params], sort_keys=True)
+    digest = hashlib.sha256(header.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(text.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ResponseCache:
+    """SQLite-backed store of model replies with size-bounded LRU eviction.
+
+    Safe to share between threads; every statement runs under one lock.
+    """
+    def __init__(self, path=None, max_bytes=MAX_CACHE_BYTES):
+        if path is None:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            path = os.path.join(CACHE_DIR, "responses.sqlite3")
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._db:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    last_used REAL NOT NULL
+                )""")
+            self._db.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses(last_used)")
+            self._db.execute("CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            self._db.execute("INSERT OR IGNORE INTO counters VALUES ('hits', 0), ('misses', 0)")
+
+    def get(self, key: str):
+        """Return the cached reply for key, or None"""
+        with self._lock, self._db:
+            row = self._db.execute("SELECT value FROM responses WHERE key = ?", (key,)).fetchone()
+            counter = "hits" if row else "misses"
+            self._db.execute("UPDATE counters SET value = value + 1 WHERE name = ?", (counter,))
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._db.execute("UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key))
+            return row[0]
+
+    def put(self, key: str, value: str):
+        """Store a reply, evicting the least recently used ones if over budget"""
+        size = len(value.encode("utf-8"))
+        with self._lock, self._db:
+            self._db.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                             (key, value, size, time.time()))
+            self._evict()
+
+    def _evict(self):
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Trim to 90% so a full cache doesn't evict on every single put
+        target = total - int(self.max_bytes * 0.9)
+        freed = 0
+        doomed = []
+        for key, size in self._db.execute("SELECT key, size FROM responses ORDER BY last_used"):
+            if freed >= target:
+                break
+            doomed.append((key,))
+            freed += size
+        self._db.executemany("DELETE FROM responses WHERE key = ?", doomed)
+
+    def stats(self) -> dict:
+        """Hit/miss counters (this session and all time) plus current size"""
+        with self._lock:
+            entries, size = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+            totals = dict(self._db.execute("SELECT name, value FROM counters"))
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "total_hits": totals["hits"],
+            "total_misses": totals["misses"],
+            "entries": entries,
+            "bytes": size,
+        }
+
+    def clear(self):
+        """Drop every cached reply"""
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM responses")
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """Return the process-wide response cache, or None when caching is disabled"""
+    global _cache
+    if not CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache()
+        return _cache
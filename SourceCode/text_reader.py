@@ -0,0 +1,199 @@
+import csv
+import mmap
+import codecs
+
+try:
+    from charset_normalizer import from_bytes
+except ImportError:
+    from_bytes = None
+
+# Bytes decoded per step; memory use stays around this no matter the file size
+BLOCK_SIZE = 1024 * 1024
+# Bytes looked at when guessing the encoding
+SAMPLE_SIZE = 64 * 1024
+# A "line" longer than this is cut, so a file without newlines can't fill memory
+MAX_LINE_CHARS = 64 * 1024
+# Lines (or CSV rows) grouped into one record
+LINES_PER_RECORD = 256
+
+BOMS = (
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+# Column names that mark a vocabulary list or running text, checked in order
+VOCABULARY_COLUMNS = ("word", "words", "term", "vocab", "vocabulary", "definition", "meaning", "translation")
+CONTENT_COLUMNS = ("text", "content", "body", "notes", "note", "description", "summary")
+
+
+def detect_encoding(sample: bytes) -> str:
+    """Guess the encoding of a file from its first bytes"""
+    for bom, encoding in BOMS:
+        if sample.startswith(bom):
+            return encoding
+    try:
+        # final=False: the sample may end in the middle of a character
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        pass
+    if from_bytes is not None:
+        best = from_bytes(sample).best()
+        if best is not None:
+            return best.encoding
+    # Windows-1252 leaves a few bytes undefined; Latin-1 decodes anything
+    try:
+        sample.decode("cp1252")
+        return "cp1252"
+    except UnicodeDecodeError:
+        return "latin-1"
+
+
+def iter_decoded(filepath: str, block_size: int = BLOCK_SIZE):
+    """Yield the text of a file in decoded blocks, reading it through mmap"""
+    with open(filepath, "rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files can't be mapped
+            return
+        with mm:
+            if hasattr(mm, "madvise"):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            encoding = detect_encoding(mm[:SAMPLE_SIZE])
+            # Bytes the guess didn't cover become U+FFFD instead of failing a long read halfway
+            decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+            for start in range(0, len(mm), block_size):
+                text = decoder.decode(mm[start:start + block_size])
+                if text:
+                    yield text
+            tail = decoder.decode(b"", final=True)
+            if tail:
+                yield tail
+
+
+def iter_lines(filepath: str, keepends: bool = False):
+    """Yield the lines of a text file one at a time, in constant memory"""
+    pending = ""
+    for block in iter_decoded(filepath):
+        lines = (pending + block).split("\n")
+        pending = lines.pop()
+        if keepends:
+            yield from (line + "\n" for line in lines)
+        else:
+            yield from (line[:-1] if line.endswith("\r") else line for line in lines)
+        while len(pending) > MAX_LINE_CHARS:
+            yield pending[:MAX_LINE_CHARS]
+            pending = pending[MAX_LINE_CHARS:]
+    if pending:
+        yield pending if keepends else pending.rstrip("\r")
+
+
+def iter_txt_records(filepath: str):
+    """Yield blocks of LINES_PER_RECORD lines of a text file"""
+    block = []
+    for line in iter_lines(filepath):
+        block.append(line)
+        if len(block) == LINES_PER_RECORD:
+            yield "\n".join(block)
+            block = []
+    if block:
+        yield "\n".join(block)
+
+
+def _pick_columns(header: list, columns=None) -> list:
+    """Indexes of the columns to keep: the requested ones, vocabulary, content, or all"""
+    names = [name.strip().lower() for name in header]
+    if columns:
+        wanted = [c.strip().lower() if isinstance(c, str) else c for c in columns]
+        picked = [c if isinstance(c, int) else names.index(c) for c in wanted if isinstance(c, int) or c in names]
+        if not picked:
+            raise ValueError(f"None of the columns {list(columns)} are in the CSV header")
+        return picked
+    for known in (VOCABULARY_COLUMNS, CONTENT_COLUMNS):
+        picked = [i for i, name in enumerate(names) if name in known]
+        if picked:
+            return picked
+    return list(range(len(header)))
+
+
+def _is_number(value: str) -> bool:
+    try:
+        float(value.replace(",", ""))
+        return True
+    except ValueError:
+        return False
+
+
+def _has_header(first: list, rows: list) -> bool:
+    """Whether first is a header row, given a sample of the rows after it.
+
+    Known column names decide it; otherwise only type evidence counts: a
+    column that is numeric in every row but not in the first one. A word
+    list is all text, so csv.Sniffer's length-based guess would take the
+    first word and definition for column names.
+    """
+    if any(name.strip().lower() in VOCABULARY_COLUMNS + CONTENT_COLUMNS for name in first):
+        return True
+    for i, name in enumerate(first):
+        values = [row[i] for row in rows if i < len(row) and row[i].strip()]
+        if values and all(_is_number(v) for v in values) and not _is_number(name):
+            return True
+    return False
+
+
+def iter_csv_rows(filepath: str, columns=None):
+    """Yield (header, row) pairs for the selected columns of a CSV file.
+
+    columns may name header fields or give 0-based indexes. Without it,
+    vocabulary columns (word, term, definition, ...) are used if present,
+    then text columns (text, content, notes, ...), then every column.
+    A file without a header row yields None for the header.
+    """
+    sample = "".join(line for line, _ in zip(iter_lines(filepath, keepends=True), range(64)))
+    if not sample.strip():
+        return
+    try:
+        dialect = csv.Sniffer().sniff(sample, delimiters=",;\t|")
+    except csv.Error:
+        dialect = csv.excel
+    rows = csv.reader(iter_lines(filepath, keepends=True), dialect)
+    first = next(rows, None)
+    if first is None:
+        return
+    sample_rows = list(csv.reader(sample.splitlines(keepends=True)[1:], dialect))
+    has_header = _has_header(first, sample_rows)
+    header = first if has_header else [f"column {i + 1}" for i in range(len(first))]
+    picked = _pick_columns(header, columns)
+    selected = [header[i] for i in picked if i < len(header)] if has_header else None
+    if not has_header:
+        yield selected, [first[i].strip() for i in picked if i < len(first)]
+    for row in rows:
+        values = [row[i].strip() for i in picked if i < len(row)]
+        if any(values):
+            yield selected, values
+
+
+def iter_csv_records(filepath: str, columns=None):
+    """Yield blocks of LINES_PER_RECORD CSV rows as text.
+
+    A word list, or any file without a header, comes out as "word -
+    definition" lines; other columns as "name: value" pairs so the model
+    can tell the fields apart.
+    """
+    block = []
+    for header, values in iter_csv_rows(filepath, columns):
+        if len(values) == 1:
+            block.append(values[0])
+        elif header is None or header[0].strip().lower() in VOCABULARY_COLUMNS:
+            block.append(" - ".join(v for v in values if v))
+        else:
+            block.append("; ".join(f"{name}: {value}" for name, value in zip(header, values) if value))
+        if len(block) == LINES_PER_RECORD:
+            yield "\n".join(block)
+            block = []
+    if block:
+        yield "\n".join(block)
+
@@ -0,0 +1,106 @@
+import tkinter as tk
+import tkinter.font as tkfont
+
+
+class VirtualList(tk.Frame):
+    """A Listbox that only holds the rows currently on screen.
+
+    items is any list; the widget keeps a reference and reads the visible
+    slice of it when scrolled. Call appended() after adding to the end of
+    items (constant time, whatever the length) and set_items() after
+    replacing or clearing it.
+    """
+    def __init__(self, parent, items, format_row=str, font=None, **listbox_options):
+        tk.Frame.__init__(self, parent)
+        self.items = items
+        self.format_row = format_row
+        self.first = 0   # index in items of the top visible row
+        self.rows = 1    # how many rows fit, updated when the widget is resized
+
+        self.scrollbar = tk.Scrollbar(self, orient="vertical", command=self.yview)
+        self.scrollbar.pack(side="right", fill="y")
+        self.listbox = tk.Listbox(self, font=font, activestyle="none", **listbox_options)
+        self.listbox.pack(side="left", fill="both", expand=True)
+        # Row height and border as Tk's listbox computes them
+        linespace = tkfont.Font(font=self.listbox.cget("font")).metrics("linespace")
+        self.line_height = linespace + 1 + 2 * int(self.listbox.cget("selectborderwidth"))
+        self.inset = 2 * (int(self.listbox.cget("borderwidth")) + int(self.listbox.cget("highlightthickness")))
+
+        self.listbox.bind("<Configure>", self._on_resize)
+        # The listbox only holds the visible rows, so scrolling is done here instead of by Tk
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.listbox.bind(sequence, self._on_wheel)
+        for sequence, step in (("<Up>", -1), ("<Down>", 1), ("<Prior>", "page-up"), ("<Next>", "page-down")):
+            self.listbox.bind(sequence, lambda e, step=step: self._on_key(step))
+
+    def set_items(self, items):
+        """Show a different (or cleared) list, scrolled to the top"""
+        self.items = items
+        self.first = 0
+        self.render()
+
+    def appended(self):
+        """Show the entry just added to the end of items"""
+        total = len(self.items)
+        last = total - 1
+        if last < self.first + self.rows:
+            # Fits in the view without scrolling
+            self.listbox.insert("end", self.format_row(last, self.items[last]))
+        elif last == self.first + self.rows:
+            # The view was showing the end of the list: follow it by one row
+            self.listbox.delete(0)
+            self.listbox.insert("end", self.format_row(last, self.items[last]))
+            self.first += 1
+        self._update_scrollbar()
+
+    def render(self):
+        """Redraw the visible rows from items"""
+        self.first = max(0, min(self.first, len(self.items) - self.rows))
+        self.listbox.delete(0, "end")
+        stop = min(len(self.items), self.first + self.rows)
+        self.listbox.insert("end", *(self.format_row(i, self.items[i]) for i in range(self.first, stop)))
+        self._update_scrollbar()
+
+    def scroll_to(self, first):
+        if first != self.first:
+            self.first = first
+            self.render()
+
+    def yview(self, *args):
+        """Scrollbar command: ('moveto', fraction) or ('scroll', n, 'units'|'pages')"""
+        if not args:
+            return
+        if args[0] == "moveto":
+            self.scroll_to(int(float(args[1]) * len(self.items)))
+        elif args[0] == "scroll":
+            step = int(args[1]) * (self.rows if args[2] == "pages" else 1)
+            self.scroll_to(max(0, min(self.first + step, len(self.items) - self.rows)))
+
+    def _update_scrollbar(self):
+        total = len(self.items)
+        if total <= self.rows:
+            self.scrollbar.set(0, 1)
+        else:
+            self.scrollbar.set(self.first / total, (self.first + self.rows) / total)
+
+    def _on_resize(self, event):
+        rows = max(1, (event.height - self.inset) // self.line_height)
+        if rows != self.rows:
+            self.rows = rows
+            self.render()
+
+    def _on_wheel(self, event):
+        if event.num == 4 or getattr(event, "delta", 0) > 0:
+            self.yview("scroll", -3, "units")
+        else:
+            self.yview("scroll", 3, "units")
+        return "break"
+
+    def _on_key(self, step):
+        if step == "page-up":
+            self.yview("scroll", -1, "pages")
+        elif step == "page-down":
+            self.yview("scroll", 1, "pages")
+        else:
+            self.yview("scroll", step, "units")
+        return "break"
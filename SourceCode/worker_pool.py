@@ -0,0 +1,83 @@
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# ~60 fps: poll the result queue once per frame while jobs are running
+POLL_INTERVAL_MS = 16
+# Never spend more than half a frame handing results back to the UI
+DRAIN_BUDGET_S = 0.008
+
+
+class WorkerPool:
+    """Runs blocking jobs (AI calls, file parsing) off the Tk main thread.
+
+    Worker threads never touch widgets. Everything they produce goes through
+    a queue that the main thread drains with after() polling, so callbacks
+    always run on the Tk thread.
+    """
+    def __init__(self, root, max_workers=4, poll_interval=POLL_INTERVAL_MS):
+        self.root = root
+        self.poll_interval = poll_interval
+        self.executor = ThreadPoolExecutor(max_workers=max_workers,
+                                           thread_name_prefix="bramble-worker")
+        self.results = queue.Queue()
+        self.in_flight = 0
+        self._poll_id = None
+        self._closed = False
+
+    def submit(self, func, *args, on_done=None, on_error=None, **kwargs):
+        """Run func(*args, **kwargs) on a worker thread.
+
+        on_done(result) or on_error(exception) is called on the Tk thread.
+        """
+        self.in_flight += 1
+        future = self.executor.submit(func, *args, **kwargs)
+        future.add_done_callback(lambda f: self.results.put((f, on_done, on_error)))
+        self._ensure_polling()
+        return future
+
+    def post(self, callback, *args):
+        """Schedule callback(*args) on the Tk thread. Safe to call from any thread."""
+        self.results.put((None, callback, args))
+
+    def _ensure_polling(self):
+        if self._poll_id is None and not self._closed:
+            self._poll_id = self.root.after(self.poll_interval, self._poll)
+
+    def _poll(self):
+        self._poll_id = None
+        deadline = time.perf_counter() + DRAIN_BUDGET_S
+        while time.perf_counter() < deadline:
+            try:
+                future, on_done, extra = self.results.get_nowait()
+            except queue.Empty:
+                break
+            if future is None:
+                # A plain callback posted from a worker thread
+                on_done(*extra)
+                continue
+            self.in_flight -= 1
+            self._deliver(future, on_done, extra)
+        # Keep polling only while there is something left to hand back
+        if self.in_flight or not self.results.empty():
+            self._ensure_polling()
+
+    def _deliver(self, future, on_done, on_error):
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is None:
+            if on_done:
+                on_done(future.result())
+        elif on_error:
+            on_error(error)
+        else:
+            print(f"Background job failed: {error}")
+
+    def shutdown(self):
+        """Stop polling and abandon queued jobs (used when the window closes)"""
+        self._closed = True
+        if self._poll_id is not None:
+            self.root.after_cancel(self._poll_id)
+            self._poll_id = None
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,169 @@
+"""Generate quizzes and notes for a whole folder of course files, without prompts.
+
+Results are appended to a JSON Lines file, one object per document and run.
+Running again only does the tasks a document (matched by content) has no
+result for yet, so an interrupted batch picks up where it stopped and a new
+task can be added to a finished one.
+
+    python batch_ingest.py "course/**/*.pdf" slides/ -o course.jsonl --tasks quiz,notes
+"""
+import os
+import sys
+import glob
+import json
+import time
+import asyncio
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "SourceCode"))
+import llm_engine
+from ai_functions import quiz_ai_async, notes_ai_async
+from extraction import SUPPORTED_EXTENSIONS, EXTRACT_WORKERS, extract_text_from_file
+from extraction_cache import file_digest
+from boilerplate import CleanupStats
+
+TASKS = {"quiz": quiz_ai_async, "notes": notes_ai_async}
+
+
+def find_files(inputs: list) -> list:
+    """Supported files under the given directories, globs and paths, sorted, without duplicates"""
+    found = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            paths = glob.glob(os.path.join(item, "**", "*"), recursive=True)
+        else:
+            paths = glob.glob(item, recursive=True)
+        found.update(os.path.abspath(p) for p in paths
+                     if os.path.isfile(p) and os.path.splitext(p)[-1].lower() in SUPPORTED_EXTENSIONS)
+    return sorted(found)
+
+
+def load_finished(output: str) -> set:
+    """(content hash, task) pairs already written to output without an error"""
+    finished = set()
+    if not os.path.exists(output):
+        return finished
+    with open(output, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # a line cut short by an interrupted run
+            errors = record.get("error") or {}
+            for task in TASKS:
+                if record.get("sha256") and task in record and task not in errors:
+                    finished.add((record["sha256"], task))
+    return finished
+
+
+class Batch:
+    def __init__(self, files, output, tasks, jobs, extract_workers, resume=True):
+        self.files = files
+        self.output = output
+        self.tasks = tasks
+        self.jobs = jobs
+        self.extractor = ThreadPoolExecutor(max_workers=extract_workers, thread_name_prefix="extract")
+        self.finished = load_finished(output) if resume else set()
+        self.done = 0
+        self.skipped = 0
+        self.failed = 0
+
+    async def process(self, filepath, out, ahead, slots):
+        async with ahead:
+            await self._process(filepath, out, slots)
+
+    async def _process(self, filepath, out, slots):
+        loop = asyncio.get_running_loop()
+        name = os.path.relpath(filepath)
+        start = time.perf_counter()
+        record = {"file": filepath}
+        try:
+            record["sha256"] = await loop.run_in_executor(self.extractor, file_digest, filepath)
+            tasks = [task for task in self.tasks if (record["sha256"], task) not in self.finished]
+            if not tasks:
+                self.skipped += 1
+                self._progress(name, "already done")
+                return
+            stats = CleanupStats()
+            text = await loop.run_in_executor(self.extractor, extract_text_from_file, filepath, stats)
+            if stats.pages:
+                print(stats.report(name), flush=True)
+            # Extraction runs a little ahead so the next documents are ready when a slot frees up
+            async with slots:
+                results = await asyncio.gather(*(TASKS[task](text) for task in tasks),
+                                               return_exceptions=True)
+            for task, result in zip(tasks, results):
+                if isinstance(result, Exception):
+                    record.setdefault("error", {})[task] = str(result)
+                else:
+                    record[task] = result
+        except Exception as e:
+            record["error"] = {"extract": str(e)}
+        record["seconds"] = round(time.perf_counter() - start, 2)
+        out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        out.flush()
+        if "error" in record:
+            self.failed += 1
+            self._progress(name, f"failed: {record['error']}")
+        else:
+            self.done += 1
+            self._progress(name, f"ok in {record['seconds']:.1f}s")
+
+    def _progress(self, name, status):
+        count = self.done + self.skipped + self.failed
+        print(f"[{count}/{len(self.files)}] {name}: {status}", flush=True)
+
+    async def run(self):
+        slots = asyncio.Semaphore(self.jobs)
+        # Bounds how many extracted texts wait in memory for a generation slot
+        ahead = asyncio.Semaphore(2 * self.jobs)
+        with open(self.output, "a", encoding="utf-8") as out:
+            await asyncio.gather(*(self.process(filepath, out, ahead, slots) for filepath in self.files))
+        self.extractor.shutdown()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("inputs", nargs="+", help="directories, files or glob patterns (quote globs)")
+    parser.add_argument("-o", "--output", default="bramble_results.jsonl", help="JSON Lines file to append to")
+    parser.add_argument("--tasks", default="quiz,notes", help="comma-separated: quiz, notes")
+    parser.add_argument("--jobs", type=int, default=4, help="documents being generated at once")
+    parser.add_argument("--concurrency", type=int, default=llm_engine.MAX_CONCURRENCY,
+                        help="model requests in flight at once")
+    parser.add_argument("--extract-workers", type=int, default=min(4, EXTRACT_WORKERS),
+                        help="files extracted at once")
+    parser.add_argument("--no-resume", action="store_true", help="redo documents already in the output")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    tasks = [t.strip() for t in args.tasks.split(",") if t.strip()]
+    unknown = [t for t in tasks if t not in TASKS]
+    if unknown or not tasks:
+        print(f"❌ Error: unknown task(s) {unknown}; choose from {', '.join(TASKS)}")
+        return 2
+    files = find_files(args.inputs)
+    if not files:
+        print("❌ Error: no PDF, DOCX, PPTX, TXT or CSV files found.")
+        return 1
+
+    engine = llm_engine.configure(max_concurrency=args.concurrency)
+    batch = Batch(files, args.output, tasks, args.jobs, args.extract_workers, resume=not args.no_resume)
+    print(f"📂 {len(files)} documents, tasks: {', '.join(tasks)}, output: {args.output}")
+    start = time.perf_counter()
+    engine.run(batch.run())
+    elapsed = time.perf_counter() - start
+
+    usage = engine.usage
+    tokens = usage["prompt_tokens"] + usage["completion_tokens"]
+    print(f"\n✅ {batch.done} done, {batch.skipped} skipped, {batch.failed} failed in {elapsed:.1f}s")
+    print(f"   {batch.done / elapsed * 60:.1f} docs/min, {usage['requests']} model requests, "
+          f"{tokens} tokens ({tokens / elapsed:.0f} tokens/s, "
+          f"{usage['completion_tokens'] / elapsed:.0f} generated tokens/s)")
+    return 1 if batch.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
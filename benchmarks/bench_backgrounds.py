@@ -0,0 +1,72 @@
+"""Per-page background load time: PNG decoded with PIL vs the pre-sized PPM asset bundle.
+
+Times the disk read and decode of each background, plus creating the Tk
+image when a display is available. Requires Pillow.
+
+    python benchmarks/bench_backgrounds.py --repeat 20
+"""
+import os
+import sys
+import time
+import tempfile
+import argparse
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SOURCE_DIR = os.path.join(HERE, "..", "SourceCode")
+sys.path.insert(0, SOURCE_DIR)
+
+import tkinter as tk
+from PIL import Image, ImageTk
+import asset_cache
+
+PICS = [os.path.abspath(os.path.join(SOURCE_DIR, "pics", f"{i}.png")) for i in range(1, 8)]
+
+
+def best_of(repeat, func):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def png_load(path):
+    image = Image.open(path)
+    image.load()
+    return image
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    try:
+        root = tk.Tk()
+        root.withdraw()
+    except tk.TclError:
+        root = None
+        print("No display: timing disk read and decode only, without creating Tk images")
+
+    with tempfile.TemporaryDirectory() as folder:
+        bundle = os.path.join(folder, "backgrounds.bundle")
+        build = best_of(1, lambda: asset_cache.build_bundle(PICS, bundle))
+        print(f"bundle build   {build * 1e3:7.1f} ms once, {os.path.getsize(bundle) / 1e6:.1f} MB")
+
+        if root is None:
+            before = best_of(args.repeat, lambda: [png_load(p) for p in PICS])
+            after = best_of(args.repeat, lambda: asset_cache.load_backgrounds(PICS, bundle))
+        else:
+            before = best_of(args.repeat, lambda: [ImageTk.PhotoImage(png_load(p)) for p in PICS])
+            after = best_of(args.repeat, lambda: [tk.PhotoImage(data=data, format="ppm")
+                                                  for data in asset_cache.load_backgrounds(PICS, bundle).values()])
+        pages = len(PICS)
+        print(f"PNG + PIL      {before * 1e3 / pages:7.2f} ms per page")
+        print(f"PPM bundle     {after * 1e3 / pages:7.2f} ms per page   ({before / after:.1f}x faster)")
+    if root is not None:
+        root.destroy()
+
+
+if __name__ == "__main__":
+    main()
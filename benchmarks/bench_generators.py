@@ -0,0 +1,92 @@
+"""End-to-end throughput/latency of the ai_functions generators against the mock server.
+
+Runs fully offline. Requires the openai package.
+
+    python benchmarks/bench_generators.py --requests 60 --concurrency 8 --latency lognormal
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "SourceCode"))
+# The benchmark measures model round-trips, so keep the response cache out of it
+os.environ.setdefault("BRAMBLE_CACHE", "0")
+os.environ.setdefault("OPENROUTER_API_KEY", "mock")
+
+from mock_llm_server import MockSettings, start_server
+import llm_engine
+import ai_functions
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def timed_call(kind, index, latencies, failures):
+    start = time.perf_counter()
+    try:
+        if kind == "quiz":
+            await ai_functions.quiz_ai_async(f"Lecture {index}: photosynthesis converts light to energy.")
+        elif kind == "notes":
+            await ai_functions.notes_ai_async(f"Lecture {index}: cells, membranes and organelles.")
+        elif kind == "mnemonics":
+            await ai_functions.mnemonics_ai_async([f"word{index}a", f"word{index}b"])
+        else:
+            await ai_functions.story_ai_async([f"dragon{index}", "castle"])
+    except Exception as e:
+        failures.append(f"{kind}: {e}")
+        return
+    latencies.append(time.perf_counter() - start)
+
+
+async def run(requests):
+    latencies, failures = [], []
+    kinds = ["quiz", "notes", "mnemonics", "story"]
+    start = time.perf_counter()
+    await asyncio.gather(*(timed_call(kinds[i % 4], i, latencies, failures) for i in range(requests)))
+    return time.perf_counter() - start, latencies, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", default="lognormal", choices=["fixed", "uniform", "exponential", "lognormal"])
+    parser.add_argument("--latency-ms", type=float, default=300.0)
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--rate-500", type=float, default=0.0)
+    parser.add_argument("--rpm-limit", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    settings = MockSettings(latency=args.latency, latency_ms=args.latency_ms, rate_429=args.rate_429,
+                            rate_500=args.rate_500, rpm_limit=args.rpm_limit, seed=args.seed)
+    server, base_url = start_server(settings)
+    engine = llm_engine.configure(max_concurrency=args.concurrency, base_url=base_url)
+    # Measure the server, not the client-side limiter, unless a quota is being simulated
+    if not args.rpm_limit:
+        engine.limiter.rate = engine.limiter.max_rate = 1000.0
+        engine.limiter.burst = engine.limiter.tokens = float(args.concurrency)
+
+    elapsed, latencies, failures = engine.run(run(args.requests))
+    server.shutdown()
+
+    print(f"requests     {args.requests} (concurrency {args.concurrency}, {args.latency} {args.latency_ms:.0f} ms)")
+    print(f"succeeded    {len(latencies)}   failed {len(failures)}")
+    print(f"wall time    {elapsed:.2f} s   throughput {len(latencies) / elapsed:.1f} req/s")
+    print(f"latency      p50 {percentile(latencies, 50) * 1e3:.0f} ms   "
+          f"p95 {percentile(latencies, 95) * 1e3:.0f} ms   p99 {percentile(latencies, 99) * 1e3:.0f} ms")
+    print(f"server       {settings.counters}")
+    for failure in failures[:5]:
+        print("  !", failure)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""History store speed: saving, paging and full-text search over many saved results.
+
+Fills a temporary history database with generated notes, quizzes, stories
+and mnemonics, then times adding one more entry, reading the newest page
+and searching.
+
+    python benchmarks/bench_history.py --entries 20000
+"""
+import os
+import sys
+import time
+import random
+import tempfile
+import argparse
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "SourceCode"))
+
+from history_store import HistoryStore
+
+ACTIONS = ["Generated notes", "Generated quiz", "Created story", "Created mnemonics"]
+WORDS = ("mitochondria membrane organelle energy photosynthesis chlorophyll enzyme protein "
+         "nucleus ribosome osmosis diffusion glucose respiration catalyst molecule atom "
+         "electron neutron isotope equilibrium velocity momentum gravity friction").split()
+# The common words are in nearly every entry (the slowest case, every row is ranked);
+# each entry also names one of 1000 chapters, like a real search for a topic
+QUERIES = ["mitochondria", "energy glucose", "photosynth", "chapter42", "chapter42 enzyme", "nothingmatches"]
+
+
+def best_of(repeat, func):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=10000)
+    parser.add_argument("--words", type=int, default=400, help="words per saved result")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as folder:
+        store = HistoryStore(os.path.join(folder, "history.db"))
+        start = time.perf_counter()
+        for i in range(args.entries):
+            body = f"chapter{i % 1000} " + " ".join(rng.choices(WORDS, k=args.words))
+            store.add(rng.choice(ACTIONS), body,
+                      created=f"2025-01-01 00:00:{i:08d}")
+        fill = time.perf_counter() - start
+        print(f"fill           {fill:7.2f} s for {args.entries} entries, "
+              f"{os.path.getsize(os.path.join(folder, 'history.db')) / 1e6:.1f} MB")
+
+        add = best_of(args.repeat, lambda: store.add("Generated notes", " ".join(rng.choices(WORDS, k=args.words))))
+        print(f"add one        {add * 1e3:7.2f} ms (including the index update)")
+        page = best_of(args.repeat, lambda: store.page())
+        print(f"newest page    {page * 1e3:7.2f} ms")
+        for query in QUERIES:
+            search = best_of(args.repeat, lambda: store.search(query))
+            print(f"search {query!r:<28} {search * 1e3:7.2f} ms, {len(store.search(query))} results")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
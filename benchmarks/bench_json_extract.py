@@ -0,0 +1,80 @@
+"""Micro-benchmark: legacy regex JSON extraction vs. json_stream's linear scanner.
+
+Run from the repository root:  python benchmarks/bench_json_extract.py
+"""
+import os
+import re
+import sys
+import json
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "SourceCode"))
+from json_stream import JsonObjectScanner, extract_json_string
+
+# The three patterns that used to live in ai_functions.py, quiz_maker.py and main5.py
+LEGACY_PATTERNS = {
+    "ai_functions": r'{\s*".*?"\s*:\s*(\[.*?\]|".*?")\s*}',
+    "quiz_maker": r'{\s*".*?"\s*:\s*\[.*?\]\s*}|{\s*".*?"\s*:\s*".*?"\s*}',
+    "main5": r'{\s*".*?\}\s*}',
+}
+
+
+def legacy_extract(pattern, text):
+    match = re.search(pattern, text, re.DOTALL)
+    return match.group() if match else None
+
+
+def make_cases(n):
+    valid = json.dumps({"quiz": [f"Question {i}: what is {{x}} \"y\"?" for i in range(n // 40)],
+                        "answers": [[f"Answer {i}"] for i in range(n // 40)]})
+    return {
+        # Many '{"' openings that never complete: the lazy regexes retry from each one
+        "unclosed openings": '{"k": ' * (n // 6),
+        "many quotes, no JSON": 'say "hi" ' * (n // 9),
+        "prose then valid JSON": "lorem ipsum " * (n // 12) + valid,
+        "nested arrays": valid,
+        "braces in strings": json.dumps({"story": "} { " * (n // 4)}),
+    }
+
+
+def timed(func, *args, repeat=3):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def streamed(text, piece=8):
+    scanner = JsonObjectScanner()
+    for i in range(0, len(text), piece):
+        if scanner.feed(text[i:i + piece]) is not None:
+            break
+    scanner.finish()
+    return scanner.text
+
+
+def main():
+    for size in (2_000, 20_000, 100_000):
+        print(f"\n== input size ~{size:,} chars ==")
+        for name, text in make_cases(size).items():
+            t_new, found = timed(extract_json_string, text)
+            t_stream, _ = timed(streamed, text)
+            ok = found is not None and isinstance(json.loads(found), dict)
+            print(f"{name:24s} scanner {t_new * 1e3:8.2f} ms  streamed {t_stream * 1e3:8.2f} ms  valid={ok}")
+            for label, pattern in LEGACY_PATTERNS.items():
+                if size > 20_000 and name == "unclosed openings":
+                    print(f"{'':24s} {label:12s}  skipped (quadratic)")
+                    continue
+                t_old, old = timed(legacy_extract, pattern, text, repeat=1)
+                try:
+                    old_ok = old is not None and isinstance(json.loads(old), dict)
+                except ValueError:
+                    old_ok = False
+                print(f"{'':24s} {label:12s} {t_old * 1e3:8.2f} ms  valid={old_ok}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""DOCX/PPTX extraction speed: streaming OOXML parse vs python-docx / python-pptx.
+
+Generates synthetic documents with python-docx and python-pptx, then times
+both extraction paths on them.
+
+    python benchmarks/bench_ooxml.py --paragraphs 20000 --slides 400
+"""
+import os
+import sys
+import time
+import tempfile
+import argparse
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "SourceCode"))
+
+import docx
+from pptx import Presentation
+from pptx.util import Inches
+import ooxml
+import extraction
+
+SENTENCE = "Mitochondria are the membrane-bound organelles that produce most of the cell's energy. "
+
+
+def make_docx(path, paragraphs):
+    document = docx.Document()
+    for i in range(paragraphs):
+        document.add_paragraph(f"{i}. " + SENTENCE * 3)
+        if i % 500 == 0:
+            table = document.add_table(rows=3, cols=3)
+            for cell in table._cells:
+                cell.text = "cell"
+    document.save(path)
+
+
+def make_pptx(path, slides):
+    prs = Presentation()
+    layout = prs.slide_layouts[1]
+    for i in range(slides):
+        slide = prs.slides.add_slide(layout)
+        slide.shapes.title.text = f"Slide {i}"
+        slide.placeholders[1].text = SENTENCE * 4
+        group = slide.shapes.add_group_shape()
+        group.shapes.add_textbox(0, 0, Inches(2), Inches(1)).text_frame.text = "grouped " + SENTENCE
+        slide.notes_slide.notes_text_frame.text = "Notes: " + SENTENCE
+    prs.save(path)
+
+
+def measure(label, func, path, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        records = list(func(path))
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    for _ in func(path):
+        pass
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    chars = sum(len(r) for r in records)
+    print(f"  {label:<14} {best * 1e3:8.1f} ms   peak {peak / 1e6:6.1f} MB   "
+          f"{len(records)} records, {chars} chars")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--paragraphs", type=int, default=10000)
+    parser.add_argument("--slides", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        docx_path = os.path.join(folder, "bench.docx")
+        pptx_path = os.path.join(folder, "bench.pptx")
+        make_docx(docx_path, args.paragraphs)
+        make_pptx(pptx_path, args.slides)
+
+        print(f"docx ({args.paragraphs} paragraphs, {os.path.getsize(docx_path) / 1e6:.1f} MB)")
+        slow = measure("python-docx", extraction.iter_docx_paragraphs_object_model, docx_path, args.repeat)
+        fast = measure("ooxml", ooxml.iter_docx_paragraphs, docx_path, args.repeat)
+        print(f"  speedup        {slow / fast:.1f}x")
+
+        print(f"pptx ({args.slides} slides, {os.path.getsize(pptx_path) / 1e6:.1f} MB)")
+        slow = measure("python-pptx", extraction.iter_pptx_slides_object_model, pptx_path, args.repeat)
+        fast = measure("ooxml", ooxml.iter_pptx_slides, pptx_path, args.repeat)
+        print(f"  speedup        {slow / fast:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+"""Offline stand-in for the OpenRouter /chat/completions API.
+
+Replies with canned JSON in the schema each generator in ai_functions
+expects (quiz, notes, mnemonics, story), with configurable latency,
+streaming speed, rate limiting and injected failures. Standard library only.
+
+    python benchmarks/mock_llm_server.py --port 8765 --latency lognormal --latency-ms 800
+    OPENROUTER_BASE_URL=http://127.0.0.1:8765/v1 OPENROUTER_API_KEY=mock python SourceCode/main4.py
+"""
+import re
+import json
+import time
+import random
+import argparse
+import threading
+from collections import deque
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+COMPLETION_PATHS = {"/chat/completions", "/v1/chat/completions", "/api/v1/chat/completions"}
+
+
+class MockSettings:
+    def __init__(self, latency="fixed", latency_ms=300.0, jitter_ms=100.0, tokens_per_sec=60.0,
+                 rate_429=0.0, rate_500=0.0, rate_malformed=0.0, rpm_limit=0, seed=None):
+        self.latency = latency
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.tokens_per_sec = tokens_per_sec
+        self.rate_429 = rate_429
+        self.rate_500 = rate_500
+        self.rate_malformed = rate_malformed
+        self.rpm_limit = rpm_limit
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.recent = deque()     # request times inside the current rate-limit window
+        self.counters = {"requests": 0, "ok": 0, "429": 0, "500": 0, "malformed": 0, "streamed": 0}
+
+    def first_token_delay(self) -> float:
+        """Seconds before the first byte, drawn from the configured distribution"""
+        mean = self.latency_ms / 1000
+        with self.lock:
+            if self.latency == "uniform":
+                spread = self.jitter_ms / 1000
+                delay = self.random.uniform(mean - spread, mean + spread)
+            elif self.latency == "exponential":
+                delay = self.random.expovariate(1 / mean) if mean > 0 else 0
+            elif self.latency == "lognormal":
+                sigma = 0.5
+                delay = self.random.lognormvariate(0, sigma) * mean / (2.718281828 ** (sigma ** 2 / 2))
+            else:
+                delay = mean
+        return max(0.0, delay)
+
+    def roll(self, rate: float) -> bool:
+        with self.lock:
+            return self.random.random() < rate
+
+    def count(self, name):
+        with self.lock:
+            self.counters[name] += 1
+
+    def admit(self):
+        """Sliding one-minute window; returns (allowed, remaining, reset_epoch_ms)"""
+        if not self.rpm_limit:
+            return True, None, None
+        now = time.time()
+        with self.lock:
+            while self.recent and now - self.recent[0] >= 60:
+                self.recent.popleft()
+            reset_ms = int(((self.recent[0] if self.recent else now) + 60) * 1000)
+            if len(self.recent) >= self.rpm_limit:
+                return False, 0, reset_ms
+            self.recent.append(now)
+            return True, self.rpm_limit - len(self.recent), reset_ms
+
+
+def canned_reply(prompt: str) -> dict:
+    """A reply in the schema the prompt asks for"""
+    words_match = re.search(r"Words:\s*(.+)\s*$", prompt)
+    words = [w.strip() for w in words_match.group(1).split(",")] if words_match else []
+    if '"quiz"' in prompt:
+        count = 5
+        return {"quiz": [f"Question {i}: Which statement about topic {i} is correct?" for i in range(1, count + 1)],
+                "answers": [f"Answer {i}: The statement about topic {i}." for i in range(1, count + 1)]}
+    if '"mnemonics"' in prompt:
+        return {"mnemonics": [f"Word: {w} - Mnemonic: Picture a {w.lower()} dancing in the rain." for w in words]}
+    if '"story"' in prompt:
+        body = " ".join(f"Then the hero met a {w}." for w in words) or "Nothing happened."
+        return {"story": "Once upon a time, a student opened a book. " + body + " And they remembered every word."}
+    return {"notes": ["Summary: The material introduces the main ideas of the lecture."]
+                     + [f"- Key point {i}: an important definition or fact." for i in range(1, 7)]}
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    settings = MockSettings()
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.rstrip("/") in ("/stats", "/v1/stats"):
+            self._send_json(200, self.settings.counters)
+        else:
+            self._send_json(404, {"error": {"message": "not found"}})
+
+    def do_POST(self):
+        if self.path.rstrip("/") not in COMPLETION_PATHS:
+            self._send_json(404, {"error": {"message": "not found"}})
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        settings = self.settings
+        settings.count("requests")
+        allowed, remaining, reset_ms = settings.admit()
+        limit_headers = {}
+        if remaining is not None:
+            limit_headers = {"X-RateLimit-Limit": str(settings.rpm_limit),
+                             "X-RateLimit-Remaining": str(remaining),
+                             "X-RateLimit-Reset": str(reset_ms)}
+        if not allowed or settings.roll(settings.rate_429):
+            settings.count("429")
+            self._send_json(429, {"error": {"message": "Rate limit exceeded", "code": 429}},
+                            {"Retry-After": "1", **limit_headers})
+            return
+        time.sleep(settings.first_token_delay())
+        if settings.roll(settings.rate_500):
+            settings.count("500")
+            self._send_json(500, {"error": {"message": "Internal server error", "code": 500}})
+            return
+        prompt = "".join(m.get("content", "") for m in body.get("messages", []))
+        content = "Here is the JSON you asked for:\n" + json.dumps(canned_reply(prompt), indent=2)
+        if settings.roll(settings.rate_malformed):
+            settings.count("malformed")
+            content = content[:len(content) // 2]
+        else:
+            settings.count("ok")
+        model = body.get("model", "mock")
+        usage = {"prompt_tokens": estimate_tokens(prompt), "completion_tokens": estimate_tokens(content)}
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        if body.get("stream"):
+            settings.count("streamed")
+            self._stream(model, content, usage, limit_headers)
+            return
+        self._send_json(200, {
+            "id": "mock-" + str(random.getrandbits(32)),
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": content}}],
+            "usage": usage,
+        }, limit_headers)
+
+    def _stream(self, model, content, usage, headers):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.close_connection = True
+        # Roughly one token per four characters, paced at tokens_per_sec
+        pieces = [content[i:i + 4] for i in range(0, len(content), 4)]
+        delay = 1 / self.settings.tokens_per_sec if self.settings.tokens_per_sec > 0 else 0
+        chunk = {"id": "mock-stream", "object": "chat.completion.chunk", "created": int(time.time()),
+                 "model": model}
+        try:
+            for piece in pieces:
+                chunk["choices"] = [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]
+                self.wfile.write(b"data: " + json.dumps(chunk).encode() + b"\n\n")
+                self.wfile.flush()
+                if delay:
+                    time.sleep(delay)
+            chunk["choices"] = [{"index": 0, "delta": {}, "finish_reason": "stop"}]
+            chunk["usage"] = usage
+            self.wfile.write(b"data: " + json.dumps(chunk).encode() + b"\n\n")
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def _send_json(self, status, payload, headers=None):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def start_server(settings=None, host="127.0.0.1", port=0):
+    """Start the mock server on a daemon thread; returns (server, base_url)"""
+    handler = type("ConfiguredMockHandler", (MockHandler,), {"settings": settings or MockSettings()})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="mock-llm", daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}/v1"
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Mock OpenRouter /chat/completions server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", choices=["fixed", "uniform", "exponential", "lognormal"], default="fixed",
+                        help="distribution of time to first token")
+    parser.add_argument("--latency-ms", type=float, default=300.0, help="mean time to first token")
+    parser.add_argument("--jitter-ms", type=float, default=100.0, help="half-width for --latency uniform")
+    parser.add_argument("--tokens-per-sec", type=float, default=60.0, help="streaming speed")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="probability of a random 429")
+    parser.add_argument("--rate-500", type=float, default=0.0, help="probability of a 500")
+    parser.add_argument("--rate-malformed", type=float, default=0.0, help="probability of truncated JSON")
+    parser.add_argument("--rpm-limit", type=int, default=0, help="enforce a requests-per-minute quota (0 = off)")
+    parser.add_argument("--seed", type=int, default=None, help="seed for reproducible runs")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    settings = MockSettings(latency=args.latency, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                            tokens_per_sec=args.tokens_per_sec, rate_429=args.rate_429, rate_500=args.rate_500,
+                            rate_malformed=args.rate_malformed, rpm_limit=args.rpm_limit, seed=args.seed)
+    MockHandler.settings = settings
+    server = ThreadingHTTPServer((args.host, args.port), MockHandler)
+    server.daemon_threads = True
+    print(f"Mock LLM server on http://{args.host}:{args.port}/v1 (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStats:", json.dumps(settings.counters))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+import os
+import sys
+import json
+import random
+import asyncio
+import functools
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "SourceCode"))
+import pytest
+import ai_functions
+import jobs
+from response_cache import ResponseCache
+
+WORDS = "cell energy membrane protein enzyme water light carbon oxygen sugar gene code".split()
+
+
+class FakeEngine:
+    """Stands in for LLMEngine: records every prompt and answers from reply(prompt)"""
+    def __init__(self, reply, served=None):
+        self.reply = reply
+        self.served = served  # model that answers, if not the one asked for
+        self.prompts = []
+
+    async def complete_with_model(self, prompt, model=ai_functions.DEFAULT_MODEL, temperature=0.7, on_token=None):
+        self.prompts.append(prompt)
+        return self.reply(prompt), self.served or model
+
+    def run(self, coro):
+        return asyncio.run(coro)
+
+
+@pytest.fixture
+def fake_engine(monkeypatch, tmp_path):
+    """Install a FakeEngine plus a response cache and job folder under tmp_path"""
+    cache = ResponseCache(str(tmp_path / "responses.sqlite3"))
+    monkeypatch.setattr(ai_functions, "get_cache", lambda: cache)
+    monkeypatch.setattr(ai_functions, "Job", functools.partial(jobs.Job, folder=str(tmp_path / "jobs")))
+
+    def install(reply, served=None):
+        engine = FakeEngine(reply, served)
+        monkeypatch.setattr(ai_functions, "get_engine", lambda: engine)
+        return engine
+    return install
+
+
+def quiz_reply(prompt):
+    return json.dumps({"quiz": ["Question 1: What is a cell?"], "answers": ["Answer 1: A unit of life."]})
+
+
+def lecture(edit=None):
+    paragraphs = []
+    for i in range(120):
+        r = random.Random(i)
+        paragraphs.append(" ".join(r.choice(WORDS) for _ in range(r.randint(40, 160))) + ".")
+    if edit is not None:
+        paragraphs[edit] = "This sentence was added in a revision. " + paragraphs[edit]
+    return "\n\n".join(paragraphs)
+
+
+def test_quiz_edit_only_reprompts_changed_sections(fake_engine, tmp_path):
+    engine = fake_engine(quiz_reply)
+    path = tmp_path / "lecture.txt"
+    path.write_text(lecture(), encoding="utf-8")
+    ai_functions.quiz_ai_from_file(str(path))
+    first = len(engine.prompts)
+    assert first > 2
+
+    ai_functions.quiz_ai_from_file(str(path))
+    assert len(engine.prompts) == first  # unchanged: every section is cached
+
+    path.write_text(lecture(edit=60), encoding="utf-8")
+    ai_functions.quiz_ai_from_file(str(path))
+    # The edited section, plus at most the neighbours a moved boundary touches
+    assert 1 <= len(engine.prompts) - first <= 3
+
+
+def mnemonics_reply(skip=()):
+    """A reply with one mnemonic per requested word, leaving out the words in skip"""
+    def reply(prompt):
+        words = prompt.rsplit("Words: ", 1)[1].split(", ")
+        return json.dumps({"mnemonics": [f"Word: {w} - Mnemonic: {w} memo" for w in words if w not in skip]})
+    return reply
+
+
+def test_mnemonics_reprompt_only_left_out_words(fake_engine):
+    skipped = {"Enzyme"}
+    def reply(prompt):
+        # Leaves a word out the first time it is asked for
+        result = mnemonics_reply(skipped)(prompt)
+        skipped.clear()
+        return result
+    engine = fake_engine(reply)
+    result = ai_functions.mnemonics_ai(["cell", "Enzyme", "gene"])
+    assert len(engine.prompts) == 2
+    assert engine.prompts[1].endswith("Words: Enzyme")
+    assert result.split("\n\n") == ["Word: cell - Mnemonic: cell memo", "Word: Enzyme - Mnemonic: Enzyme memo",
+                                    "Word: gene - Mnemonic: gene memo"]
+
+    ai_functions.mnemonics_ai(["gene", "ENZYME"])
+    assert len(engine.prompts) == 2  # every word is cached, however it is capitalised
+
+
+def test_mnemonics_mark_words_never_answered(fake_engine):
+    engine = fake_engine(mnemonics_reply({"oxygen"}))
+    result = ai_functions.mnemonics_ai(["water", "oxygen", "water"])
+    assert len(engine.prompts) == 2  # asked once more, then given up on
+    assert result.split("\n\n") == ["Word: water - Mnemonic: water memo",
+                                    f"Word: oxygen - Mnemonic: {ai_functions.NO_MNEMONIC}"]
+
+    with pytest.raises(ValueError):
+        ai_functions.mnemonics_ai(["oxygen"])  # the placeholder was not cached, and there is nothing else to show
+    assert len(engine.prompts) == 3
+
+
+def test_fallback_reply_is_not_cached_as_primary(fake_engine):
+    def reply(prompt):
+        if '"story"' in prompt:
+            return json.dumps({"story": "A cell kept a diary."})
+        return mnemonics_reply()(prompt)
+    engine = fake_engine(reply, served="fallback/model")
+    ai_functions.story_ai(["cell"])
+    ai_functions.mnemonics_ai(["cell"])
+    assert len(engine.prompts) == 2
+
+    engine.served = None  # the primary model is back
+    ai_functions.story_ai(["cell"])
+    ai_functions.mnemonics_ai(["cell"])
+    assert len(engine.prompts) == 4  # answered by the primary, not from the fallback's cached replies
+    ai_functions.story_ai(["cell"])
+    ai_functions.mnemonics_ai(["cell"])
+    assert len(engine.prompts) == 4
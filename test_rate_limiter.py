@@ -0,0 +1,91 @@
+import os
+import sys
+import types
+import asyncio
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "SourceCode"))
+import pytest
+import rate_limiter
+from rate_limiter import AdaptiveRateLimiter, ADDITIVE_STEP, DECREASE_FACTOR
+
+
+class Clock:
+    """Fake time for the limiter: sleeping just moves the clock on"""
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(rate_limiter, "time", clock)
+    monkeypatch.setattr(rate_limiter, "asyncio", types.SimpleNamespace(sleep=clock.sleep))
+    return clock
+
+
+def test_success_adds_and_throttle_halves(clock):
+    limiter = AdaptiveRateLimiter(rate=1.0, max_rate=1.1)
+    for _ in range(3):
+        limiter.on_success()
+    assert limiter.rate == pytest.approx(1.0 + 3 * ADDITIVE_STEP)
+    for _ in range(10):
+        limiter.on_success()
+    assert limiter.rate == 1.1  # capped at max_rate
+
+    limiter.on_throttle()
+    assert limiter.rate == pytest.approx(1.1 * DECREASE_FACTOR)
+    assert limiter.tokens == 0
+
+
+def test_burst_of_429s_decreases_once_per_window(clock):
+    limiter = AdaptiveRateLimiter(rate=1.0, min_rate=0.1)
+    for _ in range(5):
+        limiter.on_throttle()  # requests that were in flight together
+    assert limiter.rate == DECREASE_FACTOR
+    assert limiter.throttled == 5
+
+    clock.now += 1 / limiter.rate  # the next window
+    limiter.on_throttle()
+    assert limiter.rate == DECREASE_FACTOR ** 2
+    for _ in range(10):
+        clock.now += 100
+        limiter.on_throttle()
+    assert limiter.rate == 0.1  # never below min_rate
+
+
+def test_acquire_paces_after_burst_and_honours_retry_after(clock):
+    limiter = AdaptiveRateLimiter(rate=2.0, burst=2)
+
+    async def send(count):
+        for _ in range(count):
+            await limiter.acquire()
+    asyncio.run(send(2))
+    assert clock.slept == []  # the burst goes out back to back
+    asyncio.run(send(1))
+    assert sum(clock.slept) == pytest.approx(0.5)  # then one request per 1/rate seconds
+
+    limiter.on_throttle(retry_after=30)
+    start = clock.now
+    asyncio.run(send(1))
+    assert clock.now - start == pytest.approx(30)
+
+
+def test_headers_cap_rate_and_block_when_used_up(clock):
+    limiter = AdaptiveRateLimiter(rate=5.0)
+    reset = str((clock.now + 10) * 1000)  # epoch milliseconds
+    limiter.on_success({"x-ratelimit-remaining": "10", "x-ratelimit-reset": reset})
+    assert limiter.rate == pytest.approx(1.0)  # 10 requests left for 10 seconds
+
+    limiter.on_success({"x-ratelimit-remaining": "0", "x-ratelimit-reset": reset})
+    assert limiter.blocked_until == pytest.approx(clock.now + 10)
@@ -0,0 +1,59 @@
+import os
+import sys
+import itertools
+import types
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "SourceCode"))
+import pytest
+import response_cache
+from response_cache import ResponseCache, make_key
+
+
+@pytest.fixture
+def cache(monkeypatch, tmp_path):
+    """A 1000-byte cache whose clock ticks once per call, so recency never ties"""
+    ticks = itertools.count()
+    monkeypatch.setattr(response_cache, "time", types.SimpleNamespace(time=lambda: float(next(ticks))))
+    cache = ResponseCache(str(tmp_path / "responses.sqlite3"), max_bytes=1000)
+    yield cache
+    cache._db.close()
+
+
+def test_key_covers_every_part_of_the_request():
+    key = make_key("quiz", 1, "model-a", {"temperature": 0.7}, "text")
+    assert key == make_key("quiz", 1, "model-a", {"temperature": 0.7}, "text")
+    assert len({key,
+                make_key("notes", 1, "model-a", {"temperature": 0.7}, "text"),
+                make_key("quiz", 2, "model-a", {"temperature": 0.7}, "text"),
+                make_key("quiz", 1, "model-b", {"temperature": 0.7}, "text"),
+                make_key("quiz", 1, "model-a", {"temperature": 0.2}, "text"),
+                make_key("quiz", 1, "model-a", {"temperature": 0.7}, "text!")}) == 6
+
+
+def test_hits_and_misses_are_counted(cache):
+    assert cache.get("a") is None
+    cache.put("a", "reply")
+    assert cache.get("a") == "reply"
+    assert cache.get("a") == "reply"
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"], stats["bytes"]) == (2, 1, 1, 5)
+
+    reopened = ResponseCache(cache.path, max_bytes=1000)
+    assert reopened.get("a") == "reply"  # replies and all-time counters outlive the session
+    stats = reopened.stats()
+    assert (stats["hits"], stats["total_hits"], stats["total_misses"]) == (1, 3, 1)
+    reopened._db.close()
+
+
+def test_eviction_drops_least_recently_used_down_to_90_percent(cache):
+    for key in "abcd":
+        cache.put(key, "x" * 200)
+    cache.get("a")  # now the most recently used
+    cache.put("e", "x" * 300)  # 1100 bytes: over budget
+    kept = {key for key in "abcde" if cache.get(key) is not None}
+    assert kept == {"a", "c", "d", "e"}  # b was the oldest, and dropping it is enough
+    assert cache.stats()["bytes"] == 900  # 90% of max_bytes
+
+    cache.put("f", "x" * 400)  # 1300 bytes: the oldest two go this time
+    assert cache.get("a") is None and cache.get("c") is None
+    assert cache.stats()["bytes"] == 900
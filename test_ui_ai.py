@@ -1 +1,43 @@
-from quiz_maker import extract_text_from_file, generate_quiz_and_answers, generate_notes, generate_mnemonics
\ No newline at end of file
+from quiz_maker import extract_text_from_file, generate_quiz_and_answers, generate_notes, generate_mnemonics
+import os
+import sys
+import subprocess
+
+SOURCE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "SourceCode")
+# Loaded only once a file of that type is opened or a model is called
+HEAVY_MODULES = {"fitz", "pymupdf", "docx", "pptx", "openai", "tiktoken"}
+# Importing the GUI module, in milliseconds; the OpenAI SDK alone used to take ~600 ms
+STARTUP_BUDGET_MS = 400
+
+
+def import_times(module):
+    """Cumulative import time in microseconds of everything `import module` loads, from -X importtime"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=SOURCE_DIR, capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_ai_functions_defers_heavy_imports():
+    times = import_times("ai_functions")
+    assert not HEAVY_MODULES & set(times)
+
+
+def test_studyapp_import_within_budget():
+    times = import_times("main4")
+    assert not HEAVY_MODULES & set(times)
+    assert times["main4"] / 1000 < STARTUP_BUDGET_MS
+
+
+def test_headerless_word_list_keeps_first_pair(tmp_path):
+    sys.path.insert(0, SOURCE_DIR)
+    import text_reader
+    path = tmp_path / "words.csv"
+    path.write_text("ephemeral,lasting a very short time\nubiquitous,present everywhere\n", encoding="utf-8")
+    assert list(text_reader.iter_csv_records(str(path))) == [
+        "ephemeral - lasting a very short time\nubiquitous - present everywhere"]